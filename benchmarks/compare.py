@@ -0,0 +1,40 @@
+"""
+Compares two results files of benchmarks.endpoints:
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+STATS = ("throughput", "p50_ms", "p99_ms", "queries")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as before_file, open(args.after) as after_file:
+        before, after = json.load(before_file), json.load(after_file)
+    print(f"{before['commit'][:10]} -> {after['commit'][:10]}")
+    if before["sizes"] != after["sizes"]:
+        print(f"Warning: different sizes {before['sizes']} -> {after['sizes']}")
+
+    for mode, scenarios in after["results"].items():
+        print(f"== {mode}")
+        for name, stats in scenarios.items():
+            previous = before["results"].get(mode, {}).get(name)
+            if previous is None:
+                print(f"{name:<40} (new)")
+                continue
+            changes = []
+            for stat in STATS:
+                old, new = previous[stat], stats[stat]
+                change = f"{(new - old) / old:+.1%}" if old else "n/a"
+                changes.append(f"{stat}={old:.2f}->{new:.2f} ({change})")
+            print(f"{name:<40} " + " ".join(changes))
+
+
+if __name__ == "__main__":
+    main()
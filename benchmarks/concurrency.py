@@ -0,0 +1,164 @@
+"""
+Compares how the sync (WSGI) and the async (ASGI, uvicorn) gunicorn worker
+models scale with the number of concurrent connections.
+
+A gunicorn server is started for every worker model against a database seeded
+with production-like volumes, then loaded with an increasing number of
+concurrent connections (one request per connection):
+
+    python -m benchmarks.concurrency [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from .seed import DEFAULT_SIZES, seed_database
+from .utils import SRC_DIR, print_results, setup_django, test_database
+
+HOST = "127.0.0.1"
+WORKER_MODELS: Dict[str, Dict[str, str]] = {
+    "sync": {"GUNICORN_ASGI": "false", "PYTHON_MAX_THREADS": "1"},
+    "sync-4-threads": {"GUNICORN_ASGI": "false", "PYTHON_MAX_THREADS": "4"},
+    "asgi": {"GUNICORN_ASGI": "true"},
+}
+
+
+async def _request(port: int, path: str) -> float:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {HOST}\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    assert response.startswith(b"HTTP/1.1 200"), response[:100]
+    return (time.perf_counter() - start) * 1000
+
+
+async def _load(port: int, path: str, concurrency: int, requests: int) -> List[float]:
+    timings: List[float] = []
+
+    async def connection() -> None:
+        while len(timings) < requests:
+            timings.append(await _request(port, path))
+
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return timings
+
+
+def load(port: int, path: str, concurrency: int, requests: int) -> Dict[str, float]:
+    start = time.perf_counter()
+    timings = sorted(asyncio.run(_load(port, path, concurrency, requests)))
+    return {
+        "throughput": len(timings) / (time.perf_counter() - start),
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+@contextmanager
+def gunicorn(
+    port: int, workers: int, env: Dict[str, str]
+) -> Iterator["subprocess.Popen[bytes]"]:
+    from django.db import connection
+
+    server_env = {
+        **os.environ,
+        **env,
+        "DEBUG": "false",
+        "POSTGRES_NAME": connection.settings_dict["NAME"],
+        "WEB_CONCURRENCY": str(workers),
+        "CACHE_LOCATION": tempfile.mkdtemp(prefix="safe-config-benchmark-cache-"),
+        "DEFAULT_FILE_STORAGE": "django.core.files.storage.FileSystemStorage",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            str(SRC_DIR / "config" / "gunicorn.py"),
+            "--chdir",
+            str(SRC_DIR),
+            "--bind",
+            f"{HOST}:{port}",
+            "--access-logfile",
+            "/dev/null",
+            "--log-level",
+            "warning",
+        ],
+        env=server_env,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                asyncio.run(_request(port, "/check/"))
+                break
+            except (OSError, AssertionError):
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.2)
+        yield server
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with test_database():
+        print("Seeding...")
+        seed_database(DEFAULT_SIZES)
+        for model, env in WORKER_MODELS.items():
+            with gunicorn(args.port, args.workers, env):
+                for path in args.paths:
+                    # Loads the in-memory data and warms up every worker
+                    load(args.port, path, args.workers * 4, args.workers * 20)
+                    for concurrency in args.concurrency:
+                        results.setdefault(f"{path} c={concurrency}", {})[model] = load(
+                            args.port, path, concurrency, args.requests
+                        )
+                        print(f"{model:<16} {path} c={concurrency}")
+
+    for name, models in results.items():
+        print(f"== {name}")
+        print_results(models)
+    return {"workers": args.workers, "requests": args.requests, "results": results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        default=["/api/v1/chains/", "/api/v1/safe-apps/?chainId=1"],
+    )
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    setup_django()
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
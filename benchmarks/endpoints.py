@@ -0,0 +1,144 @@
+"""
+Measures the throughput, the latency and the number of queries of every
+/api/v1/ endpoint (and Safe Apps filter combination) on a database seeded with
+production-like volumes.
+
+Every endpoint is measured warm (responses served from the caches) and cold
+(caches cleared before every request). The results are stored as JSON, to be
+compared between commits with benchmarks.compare:
+
+    python -m benchmarks.endpoints --output before.json
+    python -m benchmarks.endpoints --output after.json
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from .seed import DEFAULT_SIZES, seed_database
+from .utils import measure, print_results, setup_django, test_database
+
+
+def get_scenarios() -> List[Tuple[str, str]]:
+    from django.urls import reverse
+
+    chains_url = reverse("v1:chains:list")
+    safe_apps_url = reverse("v1:safe-apps:list")
+    return [
+        ("about", reverse("v1:about:detail")),
+        ("chains", chains_url),
+        ("chains?ordering=name", f"{chains_url}?ordering=name"),
+        ("chains?offset=100", f"{chains_url}?limit=20&offset=100"),
+        ("chains?cursor", f"{chains_url}?cursor="),
+        ("chains?limit=all", f"{chains_url}?limit=all"),
+        ("chains/<id>", reverse("v1:chains:detail", args=[1])),
+        (
+            "chains/<short_name>",
+            reverse("v1:chains:detail_by_short_name", args=["chain-1"]),
+        ),
+        ("safe-apps", safe_apps_url),
+        ("safe-apps?chainId", f"{safe_apps_url}?chainId=1"),
+        ("safe-apps?clientUrl", f"{safe_apps_url}?clientUrl=client-1.safe.global"),
+        ("safe-apps?url", f"{safe_apps_url}?url=https://app-1.safe.global"),
+        (
+            "safe-apps?chainId&clientUrl",
+            f"{safe_apps_url}?chainId=1&clientUrl=client-1.safe.global",
+        ),
+        (
+            "safe-apps?chainId&clientUrl&url",
+            f"{safe_apps_url}?chainId=1&clientUrl=client-1.safe.global"
+            "&url=https://app-1.safe.global",
+        ),
+    ]
+
+
+def clear_caches() -> None:
+    from django.core.cache import caches
+
+    for cache in caches.all():
+        cache.clear()
+
+
+def count_queries(path: str, cold: bool) -> int:
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    client.get(path)
+    if cold:
+        clear_caches()
+    with CaptureQueriesContext(connection) as queries:
+        client.get(path)
+    return len(queries)
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(iterations: Dict[str, int], sizes: Dict[str, int]) -> Dict[str, Any]:
+    from django.test import Client
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with test_database():
+        print(f"Seeding {sizes}...")
+        seed_database(sizes)
+        client = Client()
+        for mode in ("warm", "cold"):
+            results[mode] = {}
+            for name, path in get_scenarios():
+                response = client.get(path)
+                assert response.status_code == 200, f"{path}: {response.status_code}"
+                stats = measure(
+                    lambda: client.get(path),
+                    iterations[mode],
+                    setup=clear_caches if mode == "cold" else None,
+                )
+                stats["queries"] = count_queries(path, cold=mode == "cold")
+                stats["response_bytes"] = len(response.content)
+                results[mode][name] = stats
+            print(f"== {mode}")
+            print_results(results[mode])
+
+    return {
+        "commit": get_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "iterations": iterations,
+        "sizes": sizes,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=100)
+    # Cold requests rebuild the chains snapshot or the Safe Apps index
+    parser.add_argument("--cold-iterations", type=int, default=5)
+    parser.add_argument("--output", help="JSON file the results are written to")
+    for name, size in DEFAULT_SIZES.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=size)
+    args = parser.parse_args()
+
+    setup_django()
+    report = run(
+        {"warm": args.iterations, "cold": args.cold_iterations},
+        {name: getattr(args, name) for name in DEFAULT_SIZES},
+    )
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
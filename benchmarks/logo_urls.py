@@ -0,0 +1,64 @@
+"""
+Compares the cost of resolving the currency logo URLs of the chains with the
+storage backends (as CurrencySerializer used to do for every chain) with
+serving the URLs stored when the logos are uploaded.
+
+The S3 storages are configured with dummy credentials: resolving URLs does not
+make any request.
+
+    python -m benchmarks.logo_urls [iterations]
+"""
+import sys
+
+from .utils import measure, print_results, setup_django, test_database
+
+CHAINS = 100
+
+
+def main(iterations: int) -> None:
+    setup_django()
+
+    from django.core.files.storage import default_storage
+    from storages.backends.s3boto3 import S3Boto3Storage
+
+    from chains.models import Chain
+    from chains.tests.factories import ChainFactory
+
+    storages = {
+        "FileSystemStorage": default_storage,
+        "S3Boto3Storage": S3Boto3Storage(
+            access_key="benchmark",
+            secret_key="benchmark",
+            bucket_name="benchmark",
+            region_name="eu-central-1",
+            querystring_auth=False,
+        ),
+        "S3Boto3Storage (custom domain)": S3Boto3Storage(
+            access_key="benchmark",
+            secret_key="benchmark",
+            bucket_name="benchmark",
+            custom_domain="assets.safe.global",
+            querystring_auth=False,
+        ),
+    }
+
+    with test_database():
+        ChainFactory.create_batch(CHAINS)
+        chains = list(Chain.objects.all())
+
+        results = {}
+        for name, storage in storages.items():
+            results[f"{name}.url()"] = measure(
+                lambda: [storage.url(chain.currency_logo_uri.name) for chain in chains],
+                iterations,
+            )
+        results["stored URL"] = measure(
+            lambda: [chain.get_currency_logo_url() for chain in chains], iterations
+        )
+
+        print(f"Resolving the currency logo URLs of {CHAINS} chains")
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
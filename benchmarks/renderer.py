@@ -0,0 +1,63 @@
+"""
+Compares the camelCase JSON renderer of the service with the one of
+djangorestframework_camel_case when rendering a full page of chains.
+
+    python -m benchmarks.renderer [iterations]
+"""
+import sys
+
+from .utils import measure, print_results, setup_django, test_database
+
+
+def main(iterations: int) -> None:
+    setup_django()
+
+    from django.urls import reverse
+    from djangorestframework_camel_case.render import (
+        CamelCaseJSONRenderer as LibraryCamelCaseJSONRenderer,
+    )
+    from rest_framework.test import APIClient
+
+    from chains.tests.factories import (
+        ChainFactory,
+        FeatureFactory,
+        GasPriceFactory,
+        WalletFactory,
+    )
+    from chains.views import ChainsPagination
+    from config.renderers import CamelCaseJSONRenderer
+
+    with test_database():
+        wallets = WalletFactory.create_batch(10)
+        features = FeatureFactory.create_batch(10)
+        for chain in ChainFactory.create_batch(ChainsPagination.max_limit):
+            GasPriceFactory.create_batch(3, chain=chain)
+            for wallet in wallets[::2]:
+                wallet.chains.add(chain)
+            for feature in features[::2]:
+                feature.chains.add(chain)
+
+        response = APIClient().get(
+            reverse("v1:chains:list"), {"limit": ChainsPagination.max_limit}
+        )
+        data = response.data
+        renderers = {
+            "djangorestframework_camel_case": LibraryCamelCaseJSONRenderer(),
+            "config.renderers": CamelCaseJSONRenderer(),
+        }
+        rendered = {name: renderer.render(data) for name, renderer in renderers.items()}
+        assert len(set(rendered.values())) == 1, "The renderers output differs"
+
+        print(
+            f"Rendering {len(data['results'])} chains ({len(response.content)} bytes)"
+        )
+        print_results(
+            {
+                name: measure(lambda: renderer.render(data), iterations)
+                for name, renderer in renderers.items()
+            }
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
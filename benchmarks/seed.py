@@ -0,0 +1,82 @@
+"""
+Seeds the database with production-like volumes using the test factories.
+"""
+import random
+from typing import Dict
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+DEFAULT_SIZES = {
+    "chains": 300,
+    "wallets": 40,
+    "features": 20,
+    "safe_apps": 3000,
+    "providers": 100,
+    "clients": 100,
+    "tags": 50,
+}
+
+
+def seed_database(sizes: Dict[str, int], seed: int = 0) -> None:
+    from factory.django import mute_signals
+    from factory.random import reseed_random
+
+    from chains.tests.factories import (
+        ChainFactory,
+        FeatureFactory,
+        GasPriceFactory,
+        WalletFactory,
+    )
+    from safe_apps.tests.factories import (
+        ClientFactory,
+        ProviderFactory,
+        SafeAppFactory,
+        TagFactory,
+    )
+
+    rng = random.Random(seed)
+    reseed_random(seed)
+
+    # The signal receivers (cache invalidation, CGW flushes) are not benchmarked
+    with mute_signals(post_save, post_delete, m2m_changed):
+        chains = [
+            ChainFactory.create(id=chain_id, short_name=f"chain-{chain_id}")
+            for chain_id in range(1, sizes["chains"] + 1)
+        ]
+        for chain in chains:
+            GasPriceFactory.create_batch(rng.randint(1, 3), chain=chain)
+        for index in range(sizes["wallets"]):
+            WalletFactory.create(
+                key=f"wallet-{index}",
+                chains=rng.sample(chains, rng.randint(0, len(chains))),
+            )
+        for index in range(sizes["features"]):
+            FeatureFactory.create(
+                key=f"feature-{index}",
+                chains=rng.sample(chains, rng.randint(0, len(chains))),
+            )
+
+        providers = [
+            ProviderFactory.create(url=f"https://provider-{index}.safe.global")
+            for index in range(sizes["providers"])
+        ]
+        clients = [
+            ClientFactory.create(url=f"client-{index}.safe.global")
+            for index in range(sizes["clients"])
+        ]
+        safe_apps = [
+            SafeAppFactory.create(
+                url=f"https://app-{index}.safe.global",
+                visible=rng.random() > 0.05,
+                chain_ids=[chain.id for chain in rng.sample(chains, rng.randint(1, 5))],
+                provider=rng.choice([None, *providers]),
+                # Most of the Safe Apps are not restricted to some clients
+                exclusive_clients=rng.sample(clients, rng.choice([0] * 9 + [1, 2])),
+            )
+            for index in range(sizes["safe_apps"])
+        ]
+        for index in range(sizes["tags"]):
+            TagFactory.create(
+                name=f"tag-{index}",
+                safe_apps=rng.sample(safe_apps, rng.randint(0, len(safe_apps) // 10)),
+            )
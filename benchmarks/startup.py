@@ -0,0 +1,101 @@
+"""
+Profiles the startup of a gunicorn worker: the time and the memory (RSS) it takes
+to load the WSGI application and every view (URLconf), and the modules imported
+meanwhile (using python -X importtime). No database is needed.
+
+    python -m benchmarks.startup [--top 20]
+
+The report lists the packages that are the slowest to import, with and without
+the other packages they import (eg.: the web3 stack imported by a model field).
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from .utils import SRC_DIR
+
+# Run in a new interpreter, so that nothing is imported beforehand
+WORKER = """
+import json, os, resource, sys, time
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+stages = [("interpreter", 0.0, rss_mb())]
+start = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+from config.wsgi import application
+stages.append(("WSGI application", time.perf_counter() - start, rss_mb()))
+from django.urls import get_resolver
+get_resolver().url_patterns
+stages.append(("URLconf (views)", time.perf_counter() - start, rss_mb()))
+print(json.dumps(stages))
+"""
+
+IMPORT_TIME_REGEX = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_import_times(output: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Returns the import time (in microseconds) of each package, including (first
+    value) or not (second value) the other packages it imports
+    """
+    cumulative_times: Dict[str, int] = defaultdict(int)
+    self_times: Dict[str, int] = defaultdict(int)
+    # Modules are listed after the modules they import, with one more indent
+    imported: List[Tuple[int, str, int]] = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_REGEX.match(line)
+        if match is None:
+            continue
+        self_time, cumulative_time, indent, module = match.groups()
+        package = module.split(".")[0]
+        self_times[package] += int(self_time)
+        while imported and imported[-1][0] > len(indent):
+            _, dependency, dependency_time = imported.pop()
+            if dependency != package:
+                cumulative_times[dependency] += dependency_time
+        imported.append((len(indent), package, int(cumulative_time)))
+    for _, package, cumulative_time in imported:
+        cumulative_times[package] += cumulative_time
+    return cumulative_times, self_times
+
+
+def main(top: int) -> None:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WORKER],
+        cwd=SRC_DIR,
+        env={**os.environ, "DEBUG": "false"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    stages = json.loads(process.stdout.splitlines()[-1])
+    cumulative_times, self_times = parse_import_times(process.stderr)
+
+    print("Worker startup")
+    for name, elapsed, rss in stages:
+        print(f"  {name:<38} {elapsed * 1000:>8.0f} ms {rss:>8.1f} MB RSS")
+
+    for title, times in (
+        ("including their dependencies", cumulative_times),
+        ("only their own modules", self_times),
+    ):
+        print(f"\nSlowest packages to import, {title} (top {top})")
+        for package, time in sorted(times.items(), key=lambda x: -x[1])[:top]:
+            print(f"  {package:<38} {time / 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=20)
+    main(parser.parse_args().top)
@@ -0,0 +1,85 @@
+"""
+Helpers shared by the benchmarks.
+
+The benchmarks run against a throwaway test database (the configured database
+name prefixed with test_, as when running the test suite) seeded with the test
+factories, so they can be run from the repository root with eg.:
+
+    python -m benchmarks.renderer
+    python -m benchmarks.endpoints
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(SRC_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    # Uploaded images (eg.: created by the factories) must not end up in S3
+    os.environ["DEFAULT_FILE_STORAGE"] = "django.core.files.storage.FileSystemStorage"
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.MEDIA_ROOT = tempfile.mkdtemp(prefix="safe-config-benchmark-")
+
+
+@contextmanager
+def test_database() -> Iterator[None]:
+    from django.core.cache import caches
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        for cache in caches.all():
+            cache.clear()
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(
+    func: Callable[[], Any],
+    iterations: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, float]:
+    """
+    Calls func `iterations` times (after a warm up call) and returns its throughput
+    (calls per second) and latency statistics (in milliseconds).
+    setup (if any) is called before every call of func and is not timed.
+    """
+    func()  # warm up
+    timings = []
+    for _ in range(iterations):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "throughput": len(timings) / (sum(timings) / 1000),
+        "mean_ms": statistics.mean(timings),
+        "p50_ms": timings[len(timings) // 2],
+        "p99_ms": timings[min(len(timings) - 1, int(len(timings) * 0.99))],
+    }
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    for name, stats in results.items():
+        print(
+            f"{name:<40} "
+            + " ".join(f"{stat}={value:.3f}" for stat, value in stats.items())
+        )
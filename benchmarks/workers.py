@@ -0,0 +1,134 @@
+"""
+Sweeps gunicorn worker/thread combinations (see config/gunicorn.py) to find the
+one serving the most requests per second per MB of memory.
+
+Every configuration is started against a database seeded with production-like
+volumes, warmed up and loaded with concurrent connections. Its memory is the
+proportional set size (PSS) of the master and the workers, so that the memory
+shared by the workers (eg.: preloaded modules) is only counted once:
+
+    python -m benchmarks.workers [--configurations 2x1 2x4 4x1 asgi:2] [--output results.json]
+
+A configuration is WORKERSxTHREADS (sync workers with 1 thread, gthread ones
+otherwise) or asgi:WORKERS (uvicorn workers), optionally suffixed with +preload.
+"""
+import argparse
+import json
+import multiprocessing
+from typing import Any, Dict, List, Tuple
+
+from .concurrency import gunicorn, load
+from .seed import DEFAULT_SIZES, seed_database
+from .utils import print_results, setup_django, test_database
+
+
+def parse_configuration(configuration: str) -> Tuple[int, Dict[str, str]]:
+    """
+    Returns the number of workers and the environment of a configuration
+    """
+    configuration, _, option = configuration.partition("+")
+    env = {"GUNICORN_PRELOAD": str(option == "preload").lower()}
+    if configuration.startswith("asgi:"):
+        return int(configuration.split(":")[1]), {**env, "GUNICORN_ASGI": "true"}
+    workers, threads = configuration.split("x")
+    return int(workers), {
+        **env,
+        "GUNICORN_ASGI": "false",
+        "PYTHON_MAX_THREADS": threads,
+    }
+
+
+def pss_mb(pid: int) -> float:
+    """
+    Proportional set size (in MB) of the process and of its children
+    """
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        pss_kb = next(int(line.split()[1]) for line in smaps if line.startswith("Pss:"))
+    with open(f"/proc/{pid}/task/{pid}/children") as children:
+        return pss_kb / 1024 + sum(
+            pss_mb(int(child)) for child in children.read().split()
+        )
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    with test_database():
+        print("Seeding...")
+        seed_database(DEFAULT_SIZES)
+        for configuration in args.configurations:
+            workers, env = parse_configuration(configuration)
+            with gunicorn(args.port, workers, env) as server:
+                requests: List[Dict[str, float]] = []
+                for path in args.paths:
+                    # Loads the in-memory data and warms up every worker
+                    load(args.port, path, workers * 4, workers * 20)
+                    requests.append(
+                        load(args.port, path, args.concurrency, args.requests)
+                    )
+                memory = pss_mb(server.pid)
+            throughput = sum(result["throughput"] for result in requests) / len(
+                requests
+            )
+            results[configuration] = {
+                "throughput": throughput,
+                "p99_ms": max(result["p99_ms"] for result in requests),
+                "pss_mb": memory,
+                "throughput_per_mb": throughput / memory,
+            }
+            print(f"{configuration:<16} done")
+
+    print(f"== {multiprocessing.cpu_count()} CPUs, concurrency={args.concurrency}")
+    print_results(results)
+    best = max(results, key=lambda name: results[name]["throughput_per_mb"])
+    print(f"Best throughput per MB: {best}")
+    return {
+        "cpus": multiprocessing.cpu_count(),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "results": results,
+        "best": best,
+    }
+
+
+def main() -> None:
+    cpus = multiprocessing.cpu_count()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--configurations",
+        nargs="+",
+        # Without duplicates (eg.: with a single CPU)
+        default=list(
+            dict.fromkeys(
+                [
+                    f"{cpus * 2}x1",
+                    f"{cpus + 1}x1",
+                    f"{cpus + 1}x1+preload",
+                    f"{cpus}x4",
+                    f"{cpus + 1}x4",
+                    f"{cpus * 2}x8",
+                    f"asgi:{cpus + 1}",
+                ]
+            )
+        ),
+    )
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        default=["/api/v1/chains/", "/api/v1/safe-apps/?chainId=1"],
+    )
+    parser.add_argument("--output", help="JSON file the results are written to")
+    args = parser.parse_args()
+
+    setup_django()
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,5 +10,14 @@ cp -r staticfiles/ ${DOCKER_NGINX_VOLUME_ROOT}/
 echo "==> $(date +%H:%M:%S) ==> Migrating Django models..."
 python src/manage.py migrate --noinput
 
+echo "==> $(date +%H:%M:%S) ==> Updating the currency logo URLs..."
+python src/manage.py update_currency_logo_urls
+
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+  echo "==> $(date +%H:%M:%S) ==> Cleaning Prometheus metrics of previous runs..."
+  rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+  mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 echo "==> $(date +%H:%M:%S) ==> Running Gunicorn..."
-exec gunicorn -c /app/src/config/gunicorn.py config.wsgi -b ${GUNICORN_BIND_SOCKET} -b 0.0.0.0:${GUNICORN_BIND_PORT} --chdir /app/src/
+exec gunicorn -c /app/src/config/gunicorn.py -b ${GUNICORN_BIND_SOCKET} -b 0.0.0.0:${GUNICORN_BIND_PORT} --chdir /app/src/
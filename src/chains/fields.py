@@ -0,0 +1,107 @@
+"""
+Ethereum model fields, compatible with the ones of gnosis.eth.django.models
+(same database columns and migrations).
+
+Importing gnosis.eth imports web3 and py-evm (about 2 seconds and tens of MB
+per worker), only the EIP-55 checksum is needed here.
+"""
+import re
+from typing import Any, Optional
+
+from Crypto.Hash import keccak
+from django.core import exceptions
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+_ADDRESS_REGEX = re.compile("^(0x)?[0-9a-fA-F]{40}$")
+
+
+def to_checksum_address(value: str) -> str:
+    """
+    Returns the EIP-55 checksummed address, whatever the case of value (as
+    gnosis.eth.utils.fast_to_checksum_address). Raises ValueError if the value is
+    not an address
+    """
+    if not isinstance(value, str) or not _ADDRESS_REGEX.match(value):
+        raise ValueError(f"{value} is not an address")
+    address = value[-40:].lower()
+    address_hash = keccak.new(data=address.encode(), digest_bits=256).hexdigest()
+    return "0x" + "".join(
+        character.upper() if int(hash_character, 16) >= 8 else character
+        for character, hash_character in zip(address, address_hash)
+    )
+
+
+def validate_checksumed_address(address: Any) -> None:
+    try:
+        if to_checksum_address(address) == address:
+            return
+    except ValueError:
+        pass
+    raise exceptions.ValidationError(
+        "%(address)s has an invalid checksum",
+        params={"address": address},
+    )
+
+
+class EthereumAddressField(models.CharField):  # type: ignore[type-arg]
+    default_validators = [validate_checksumed_address]
+    description = "Ethereum address (EIP55)"
+    default_error_messages = {
+        "invalid": '"%(value)s" value must be an EIP55 checksummed address.',
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["max_length"] = 42
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self) -> Any:
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs["max_length"]
+        return name, path, args, kwargs
+
+    def from_db_value(
+        self, value: Optional[str], expression: Any, connection: Any
+    ) -> Any:
+        return self.to_python(value)
+
+    def to_python(self, value: Any) -> Any:
+        value = super().to_python(value)
+        if not value:
+            return value
+        try:
+            return to_checksum_address(value)
+        except ValueError:
+            raise exceptions.ValidationError(
+                self.error_messages["invalid"],
+                code="invalid",
+                params={"value": value},
+            )
+
+    def get_prep_value(self, value: Any) -> Any:
+        return self.to_python(super().get_prep_value(value))
+
+
+class Uint256Field(models.DecimalField):  # type: ignore[type-arg]
+    """
+    Stores uint256 values in a decimal column without decimals, but retrieves them
+    as int (instead of Decimal)
+    """
+
+    description = _("Ethereum uint256 number")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs["max_digits"] = 79  # 2 ** 256 is 78 digits
+        kwargs["decimal_places"] = 0
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self) -> Any:
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs["max_digits"]
+        del kwargs["decimal_places"]
+        return name, path, args, kwargs
+
+    def from_db_value(self, value: Any, expression: Any, connection: Any) -> Any:
+        if value is None:
+            return value
+        return int(value)
@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from chains.models import Chain
+from chains.snapshot import invalidate_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Resolves the currency logo URLs of all the chains again. To be run when "
+        "the storage settings change (e.g. AWS_S3_CUSTOM_DOMAIN)."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        chains = []
+        for chain in Chain.objects.only("id", "currency_logo_uri", "currency_logo_url"):
+            url = chain.currency_logo_uri.url if chain.currency_logo_uri else ""
+            if url != chain.currency_logo_url:
+                chain.currency_logo_url = url
+                chains.append(chain)
+
+        if chains:
+            with transaction.atomic():
+                Chain.objects.bulk_update(chains, ["currency_logo_url"])
+                invalidate_snapshot()
+        self.stdout.write(f"Updated {len(chains)} currency logo URLs")
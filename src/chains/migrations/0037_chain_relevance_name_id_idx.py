@@ -0,0 +1,19 @@
+# Generated by Django 4.1.3 on 2026-10-17 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chains", "0036_alter_chain_transaction_service_uri_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chain",
+            index=models.Index(
+                fields=["relevance", "name", "id"], name="chain_relevance_name_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.1.3 on 2026-10-17 07:22
+
+from django.db import migrations, models
+
+import chains.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chains", "0037_chain_relevance_name_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chain",
+            name="currency_logo_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="chain",
+            name="currency_logo_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="chain",
+            name="currency_logo_uri",
+            field=models.ImageField(
+                max_length=255, upload_to=chains.models.native_currency_path
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.3 on 2026-10-17 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chains", "0038_chain_currency_logo_dimensions"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chain",
+            name="currency_logo_url",
+            field=models.CharField(blank=True, editable=False, max_length=1024),
+        ),
+    ]
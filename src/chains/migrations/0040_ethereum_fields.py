@@ -0,0 +1,27 @@
+# Generated by Django 4.1.3 on 2026-10-17 07:40
+
+from django.db import migrations
+
+import chains.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chains", "0039_chain_currency_logo_url"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chain",
+            name="ens_registry_address",
+            field=chains.fields.EthereumAddressField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="gasprice",
+            name="fixed_wei_value",
+            field=chains.fields.Uint256Field(
+                blank=True, null=True, verbose_name="Fixed gas price (wei)"
+            ),
+        ),
+    ]
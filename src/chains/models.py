@@ -1,14 +1,16 @@
 import os
 import re
-from typing import IO, Union
+from typing import IO, Any, Iterable, Optional, Union
 from urllib.parse import urlparse
 
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ValidationError
 from django.core.files.images import get_image_dimensions
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models import QuerySet
-from gnosis.eth.django.models import EthereumAddressField, Uint256Field
+from django.db.models import Q
+
+from .fields import EthereumAddressField, Uint256Field
 
 HEX_ARGB_REGEX = re.compile("^#[0-9a-fA-F]{6}$")
 
@@ -27,10 +29,9 @@ def native_currency_path(instance: "Chain", filename: str) -> str:
     return f"chains/{instance.id}/currency_logo{file_extension}"
 
 
-def validate_native_currency_size(image: Union[str, IO[bytes]]) -> None:
-    image_width, image_height = get_image_dimensions(
-        image
-    )  # (Optional[Int], Optional[Int])
+def validate_native_currency_dimensions(
+    image_width: Optional[int], image_height: Optional[int]
+) -> None:
     if not image_width or not image_height:
         raise ValidationError(
             f"Could not get image dimensions. Width={image_width}, Height={image_height}"
@@ -39,6 +40,10 @@ def validate_native_currency_size(image: Union[str, IO[bytes]]) -> None:
         raise ValidationError("Image width and height need to be at most 512 pixels")
 
 
+def validate_native_currency_size(image: Union[str, IO[bytes]]) -> None:
+    validate_native_currency_dimensions(*get_image_dimensions(image))
+
+
 def validate_tx_service_url(url: str) -> None:
     result = urlparse(url)
     if not all(
@@ -91,11 +96,22 @@ class Chain(models.Model):
     currency_name = models.CharField(max_length=255)
     currency_symbol = models.CharField(max_length=255)
     currency_decimals = models.IntegerField(default=18)
+    # The dimensions are validated by clean(), only when a new logo is uploaded
     currency_logo_uri = models.ImageField(
-        validators=[validate_native_currency_size],
         upload_to=native_currency_path,
         max_length=255,
     )
+    # Dimensions of the currency logo, read when it is uploaded. Null for the
+    # logos uploaded before they were stored
+    currency_logo_width = models.PositiveIntegerField(
+        null=True, blank=True, editable=False
+    )
+    currency_logo_height = models.PositiveIntegerField(
+        null=True, blank=True, editable=False
+    )
+    # Public URL of the currency logo, resolved by the storage when the logo is
+    # uploaded (see the update_currency_logo_urls command)
+    currency_logo_url = models.CharField(max_length=1024, blank=True, editable=False)
     transaction_service_uri = models.CharField(
         max_length=255, validators=[validate_tx_service_url]
     )
@@ -114,17 +130,62 @@ class Chain(models.Model):
         default="#000000",
         help_text="Please use the following format: <em>#RRGGBB</em>.",
     )
-    ens_registry_address = EthereumAddressField(null=True, blank=True)  # type: ignore[no-untyped-call]
+    ens_registry_address = EthereumAddressField(null=True, blank=True)
 
     recommended_master_copy_version = models.CharField(
         max_length=255, validators=[sem_ver_validator]
     )
 
-    def get_disabled_wallets(self) -> QuerySet["Wallet"]:
-        all_wallets = Wallet.objects.all()
-        enabled_wallets = self.wallet_set.all()
+    class Meta:
+        indexes = [
+            # Default ordering of the chains (and keyset of their pagination)
+            models.Index(
+                fields=["relevance", "name", "id"], name="chain_relevance_name_id_idx"
+            ),
+        ]
+
+    def _currency_logo_changed(self) -> bool:
+        # A new file is only committed (i.e. written to the storage) on save
+        return bool(self.currency_logo_uri) and not self.currency_logo_uri._committed
 
-        return all_wallets.difference(enabled_wallets)
+    def _update_currency_logo_dimensions(self) -> None:
+        if self._currency_logo_changed():
+            # Only the header of the uploaded file is read
+            (
+                self.currency_logo_width,
+                self.currency_logo_height,
+            ) = get_image_dimensions(self.currency_logo_uri)
+
+    def clean(self) -> None:
+        # The stored logo is never read: its dimensions were stored on upload
+        self._update_currency_logo_dimensions()
+        if self._currency_logo_changed() or self.currency_logo_width is not None:
+            try:
+                validate_native_currency_dimensions(
+                    self.currency_logo_width, self.currency_logo_height
+                )
+            except ValidationError as error:
+                raise ValidationError({"currency_logo_uri": error.messages})
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self._currency_logo_changed():
+            self._update_currency_logo_dimensions()
+            # The logo is stored before the chain (instead of by the pre_save of
+            # its field) so that its URL, which depends on its final name, is
+            # saved along with it
+            logo = self.currency_logo_uri
+            logo.save(logo.name, logo.file, save=False)
+            self.currency_logo_url = logo.url
+        super().save(*args, **kwargs)
+
+    def get_currency_logo_url(self) -> Optional[str]:
+        if not self.currency_logo_uri:
+            return None
+        # Logos uploaded before their URL was stored fall back to the storage
+        return self.currency_logo_url or self.currency_logo_uri.url
+
+    def get_disabled_wallets(self) -> list[str]:
+        return get_disabled_wallets([self.id])[self.id]
 
     def __str__(self) -> str:
         return f"{self.name} | chain_id={self.id}"
@@ -143,7 +204,7 @@ class GasPrice(models.Model):
     )
     fixed_wei_value = Uint256Field(
         verbose_name="Fixed gas price (wei)", blank=True, null=True
-    )  # type: ignore[no-untyped-call]
+    )
     rank = models.SmallIntegerField(
         default=100
     )  # A lower number will indicate higher ranking
@@ -180,6 +241,35 @@ class Wallet(models.Model):
         return f"Wallet: {self.key}"
 
 
+def get_disabled_wallets(chain_ids: Iterable[int]) -> dict[int, list[str]]:
+    """
+    Returns the keys (sorted) of the wallets disabled for each of the given chains.
+
+    A single query fetches every wallet with the chains where it is enabled, the
+    disabled wallets of each chain are then the complement of its enabled ones
+    """
+    wallets = (
+        Wallet.objects.order_by("key")
+        .annotate(
+            chain_ids=ArrayAgg(
+                "chains", filter=Q(chains__isnull=False), default=models.Value([])
+            )
+        )
+        .values_list("key", "chain_ids")
+    )
+    enabled_wallets = [
+        (key, set(enabled_chain_ids)) for key, enabled_chain_ids in wallets
+    ]
+    return {
+        chain_id: [
+            key
+            for key, enabled_chain_ids in enabled_wallets
+            if chain_id not in enabled_chain_ids
+        ]
+        for chain_id in chain_ids
+    }
+
+
 class Feature(models.Model):
     # A feature can be enabled for multiple Chains and a Chain can have multiple features enabled
     chains = models.ManyToManyField(
@@ -0,0 +1,193 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from typing import Any, NamedTuple, Optional, Sequence, cast
+
+from django.conf import settings
+from django.db.models import QuerySet
+from rest_framework.compat import coreapi, coreschema
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+
+from .snapshot import ChainEntry
+
+
+class Cursor(NamedTuple):
+    relevance: int
+    name: str
+    id: int
+    # Whether the page is made of the chains before (instead of after) the cursor
+    reverse: bool
+
+    @property
+    def key(self) -> tuple[int, str, int]:
+        return self.relevance, self.name, self.id
+
+
+def _chain_key(chain: ChainEntry) -> tuple[int, str, int]:
+    return chain.relevance, chain.name, chain.id
+
+
+class ChainsPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination of the chains with two additional modes:
+
+    - limit=all returns all the chains in a single page.
+    - cursor (keyset pagination) returns the chains following (or preceding)
+      the chain of the cursor in the default order: relevance, name and id.
+      The first page is requested with an empty cursor. There is no count.
+    """
+
+    default_limit = settings.CHAINS_PAGE_SIZE
+    max_limit = settings.CHAINS_MAX_PAGE_SIZE
+    all_limit = "all"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    cursor_query_description = (
+        "The pagination cursor (keyset pagination). Empty for the first page"
+    )
+
+    def paginate_queryset(  # type: ignore[override]
+        self,
+        queryset: Sequence[ChainEntry],
+        request: Request,
+        view: Optional[APIView] = None,
+    ) -> list[ChainEntry]:
+        self.request = request
+        self.cursor_page: Optional[tuple[bool, bool]] = None
+        if request.query_params.get(self.limit_query_param) == self.all_limit:
+            self.count = len(queryset)
+            self.limit = self.count
+            self.offset = 0
+            return list(queryset)
+        if self.is_cursor_pagination(request):
+            return self.paginate_by_cursor(queryset, request)
+        # LimitOffsetPagination only needs to count and slice the chains
+        page = super().paginate_queryset(cast(QuerySet[Any], queryset), request, view)
+        return cast(list[ChainEntry], page or [])
+
+    @classmethod
+    def is_cursor_pagination(cls, request: Request) -> bool:
+        return (
+            cls.cursor_query_param in request.query_params
+            and request.query_params.get(cls.limit_query_param) != cls.all_limit
+        )
+
+    def decode_cursor(self, request: Request) -> Optional[Cursor]:
+        encoded = request.query_params[self.cursor_query_param]
+        if not encoded:
+            return None
+        try:
+            relevance, name, chain_id, reverse = json.loads(b64decode(encoded))
+            return Cursor(int(relevance), str(name), int(chain_id), bool(reverse))
+        except (BinasciiError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, chain: ChainEntry, reverse: bool) -> str:
+        position = [chain.relevance, chain.name, chain.id, reverse]
+        assert self.request is not None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.offset_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            b64encode(json.dumps(position).encode()).decode(),
+        )
+
+    @staticmethod
+    def find_position(chains: Sequence[ChainEntry], cursor: Cursor) -> tuple[int, bool]:
+        """
+        Returns the position of the chain of the cursor and whether it was
+        found. If it was changed (or deleted) since the cursor was issued,
+        the position is the one of the first chain after the cursor. The
+        chains are sorted by the database (name collation), so the chain of
+        the cursor is looked up first and compared in Python only if needed
+        """
+        for position, chain in enumerate(chains):
+            if _chain_key(chain) == cursor.key:
+                return position, True
+        for position, chain in enumerate(chains):
+            if _chain_key(chain) > cursor.key:
+                return position, False
+        return len(chains), False
+
+    def paginate_by_cursor(
+        self, chains: Sequence[ChainEntry], request: Request
+    ) -> list[ChainEntry]:
+        cursor = self.decode_cursor(request)
+        self.limit = self.get_limit(request)
+        assert self.limit is not None  # default_limit is set
+        if cursor is None:
+            start = 0
+            end = self.limit
+        elif cursor.reverse:
+            # The chain of the cursor is excluded: it starts the next page
+            end, _ = self.find_position(chains, cursor)
+            start = max(end - self.limit, 0)
+        else:
+            position, found = self.find_position(chains, cursor)
+            start = position + 1 if found else position
+            end = start + self.limit
+        page = list(chains[start:end])
+        # (has previous, has next)
+        self.cursor_page = (start > 0, start + len(page) < len(chains))
+        self.page = page
+        return page
+
+    def get_next_link(self) -> Optional[str]:
+        if self.cursor_page is not None:
+            has_next = self.cursor_page[1] and self.page
+            return (
+                self.encode_cursor(self.page[-1], reverse=False) if has_next else None
+            )
+        if self.limit == self.count and self.offset == 0:  # All the chains
+            return None
+        return super().get_next_link()
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.cursor_page is not None:
+            has_previous = self.cursor_page[0] and self.page
+            return (
+                self.encode_cursor(self.page[0], reverse=True) if has_previous else None
+            )
+        return super().get_previous_link()
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.cursor_page is None:
+            return super().get_paginated_response(data)
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_schema_fields(self, view: APIView) -> list[coreapi.Field]:
+        return [
+            *super().get_schema_fields(view),
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location="query",
+                schema=coreschema.String(
+                    title="Cursor", description=self.cursor_query_description
+                ),
+            ),
+        ]
+
+    def get_schema_operation_parameters(self, view: APIView) -> list[dict[str, Any]]:
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.cursor_query_description,
+                "schema": {"type": "string"},
+            },
+        ]
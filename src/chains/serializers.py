@@ -1,12 +1,13 @@
 from abc import abstractmethod
+from typing import Optional
 
+from django.db.models import Prefetch, QuerySet
 from drf_yasg.utils import swagger_serializer_method
-from gnosis.eth.django.serializers import EthereumAddressField
 from rest_framework import serializers
 from rest_framework.exceptions import APIException
 from rest_framework.utils.serializer_helpers import ReturnDict
 
-from .models import Chain, Feature, GasPrice, Wallet
+from .models import Chain, Feature, GasPrice, Wallet, get_disabled_wallets
 
 
 class GasPriceOracleSerializer(serializers.Serializer[GasPrice]):
@@ -42,7 +43,12 @@ class CurrencySerializer(serializers.Serializer[Chain]):
     name = serializers.CharField(source="currency_name")
     symbol = serializers.CharField(source="currency_symbol")
     decimals = serializers.IntegerField(source="currency_decimals")
-    logo_uri = serializers.ImageField(use_url=True, source="currency_logo_uri")
+    logo_uri = serializers.SerializerMethodField()
+
+    @staticmethod
+    @swagger_serializer_method(serializer_or_field=serializers.URLField)  # type: ignore[misc]
+    def get_logo_uri(obj: Chain) -> Optional[str]:
+        return obj.get_currency_logo_url()
 
 
 class BaseRpcUriSerializer(serializers.Serializer[Chain]):
@@ -115,7 +121,7 @@ class ChainSerializer(serializers.ModelSerializer[Chain]):
     vpc_transaction_service = serializers.URLField(source="vpc_transaction_service_uri")
     theme = serializers.SerializerMethodField()
     gas_price = serializers.SerializerMethodField()
-    ens_registry_address = EthereumAddressField()
+    ens_registry_address = serializers.ReadOnlyField()
     disabled_wallets = serializers.SerializerMethodField()
     features = serializers.SerializerMethodField()
 
@@ -142,6 +148,27 @@ class ChainSerializer(serializers.ModelSerializer[Chain]):
             "features",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset: QuerySet[Chain]) -> QuerySet[Chain]:
+        """
+        Prefetches (already sorted) the relations rendered by this serializer
+        so that the number of queries does not depend on the number of chains
+        """
+        return queryset.prefetch_related(
+            Prefetch("gasprice_set", queryset=GasPrice.objects.order_by("rank")),
+            Prefetch("feature_set", queryset=Feature.objects.order_by("key")),
+        )
+
+    def _get_disabled_wallets(self, chain: Chain) -> list[str]:
+        # The context is shared by every child of a ListSerializer. It can be
+        # given the disabled wallets of all the chains (see get_disabled_wallets)
+        disabled_wallets: dict[int, list[str]] = self.context.setdefault(
+            "disabled_wallets", {}
+        )
+        if chain.id not in disabled_wallets:
+            disabled_wallets.update(get_disabled_wallets([chain.id]))
+        return disabled_wallets[chain.id]
+
     @staticmethod
     @swagger_serializer_method(serializer_or_field=CurrencySerializer)  # type: ignore[misc]
     def get_native_currency(obj: Chain) -> ReturnDict:
@@ -174,15 +201,14 @@ class ChainSerializer(serializers.ModelSerializer[Chain]):
 
     @swagger_serializer_method(serializer_or_field=GasPriceSerializer)  # type: ignore[misc]
     def get_gas_price(self, instance) -> ReturnDict:  # type: ignore[no-untyped-def]
-        ranked_gas_prices = instance.gasprice_set.all().order_by("rank")
+        ranked_gas_prices = instance.gasprice_set.all()
         return GasPriceSerializer(ranked_gas_prices, many=True).data
 
     @swagger_serializer_method(serializer_or_field=WalletSerializer)  # type: ignore[misc]
-    def get_disabled_wallets(self, instance) -> ReturnDict:  # type: ignore[no-untyped-def]
-        disabled_wallets = instance.get_disabled_wallets().order_by("key")
-        return WalletSerializer(disabled_wallets, many=True).data
+    def get_disabled_wallets(self, instance) -> list[str]:  # type: ignore[no-untyped-def]
+        return self._get_disabled_wallets(instance)
 
     @swagger_serializer_method(serializer_or_field=FeatureSerializer)  # type: ignore[misc]
     def get_features(self, instance) -> ReturnDict:  # type: ignore[no-untyped-def]
-        enabled_features = instance.feature_set.all().order_by("key")
+        enabled_features = instance.feature_set.all()
         return FeatureSerializer(enabled_features, many=True).data
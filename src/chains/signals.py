@@ -2,47 +2,81 @@ import logging
 from typing import Any
 
 from django.conf import settings
-from django.db.models.signals import post_delete, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 import clients.safe_client_gateway
+from config.cache import invalidations_suspended
 
 from .models import Chain, Feature, GasPrice, Wallet
+from .snapshot import invalidate_snapshot
 
 logger = logging.getLogger(__name__)
 
 
 def _flush_cgw_chains() -> None:
-    clients.safe_client_gateway.flush(
-        cgw_url=settings.CGW_URL,
-        cgw_flush_token=settings.CGW_FLUSH_TOKEN,
-        json={"invalidate": "Chains"},
+    # Queued once the changes are committed. All the flushes of a transaction
+    # (e.g. a Chain saved with its inlines) are coalesced into a single request
+    transaction.on_commit(
+        lambda: clients.safe_client_gateway.flush(
+            cgw_url=settings.CGW_URL,
+            cgw_flush_token=settings.CGW_FLUSH_TOKEN,
+            json={"invalidate": "Chains"},
+        )
     )
 
 
 @receiver(post_save, sender=Chain)
 @receiver(post_delete, sender=Chain)
 def on_chain_update(sender: Chain, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
     logger.info("Chain update. Triggering CGW webhook")
+    invalidate_snapshot()
     _flush_cgw_chains()
 
 
 @receiver(post_save, sender=GasPrice)
 @receiver(post_delete, sender=GasPrice)
 def on_gas_price_update(sender: GasPrice, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
     logger.info("GasPrice update. Triggering CGW webhook")
+    invalidate_snapshot()
     _flush_cgw_chains()
 
 
 @receiver(post_save, sender=Feature)
 @receiver(post_delete, sender=Feature)
 def on_feature_update(sender: Feature, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
     logger.info("Feature update. Triggering CGW webhook")
+    invalidate_snapshot()
     _flush_cgw_chains()
 
 
 @receiver(post_save, sender=Wallet)
 @receiver(post_delete, sender=Wallet)
 def on_wallet_update(sender: Wallet, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
     logger.info("Wallet update. Triggering CGW webhook")
+    invalidate_snapshot()
     _flush_cgw_chains()
+
+
+# Enabling a Feature/Wallet for a chain (e.g. with the inlines of the Chain admin)
+# only changes the M2M through tables, which does not send the signals above
+@receiver(m2m_changed, sender=Feature.chains.through)
+@receiver(post_save, sender=Feature.chains.through)
+@receiver(post_delete, sender=Feature.chains.through)
+@receiver(m2m_changed, sender=Wallet.chains.through)
+@receiver(post_save, sender=Wallet.chains.through)
+@receiver(post_delete, sender=Wallet.chains.through)
+def on_chains_relation_update(sender: Any, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
+    logger.info("Chain relation update. Invalidating chains snapshot")
+    invalidate_snapshot()
@@ -0,0 +1,220 @@
+import logging
+import time
+from typing import Any, NamedTuple, Optional, Sequence
+
+from django.core.cache import caches
+from rest_framework.exceptions import APIException
+
+from config.cache import (
+    ConfigVersion,
+    SingleFlight,
+    on_commit_once,
+    revalidate_in_background,
+)
+from config.metrics import observe_cache_lookup, track_serialization
+
+from .models import Chain, get_disabled_wallets
+from .serializers import ChainSerializer
+
+logger = logging.getLogger(__name__)
+
+# A snapshot is fresh for SNAPSHOT_TIMEOUT. It is then still served for
+# SNAPSHOT_STALE_TIMEOUT while being built again in the background. Snapshots of
+# previous versions are never read again, so they just age out
+SNAPSHOT_TIMEOUT = 60 * 10  # 10 minutes
+SNAPSHOT_STALE_TIMEOUT = 60 * 60  # 1 hour
+
+chains_version = ConfigVersion("chains:version")
+
+# A snapshot is built by one thread of one worker, the others wait for it
+_snapshot_builds = SingleFlight("chains-snapshot", across_processes=True)
+
+
+class ChainEntry(NamedTuple):
+    id: int
+    short_name: str
+    name: str
+    relevance: int
+    # Position of the chain when sorted by name (using the database collation)
+    name_rank: int
+    # ChainSerializer payload, or the error raised while serializing the chain
+    data: Optional[dict[str, Any]]
+    error: Optional[str]
+
+
+class ChainsSnapshot(NamedTuple):
+    version: int
+    chains: list[ChainEntry]  # sorted by relevance, name and id
+    by_id: dict[int, ChainEntry]
+    by_short_name: dict[str, ChainEntry]
+    built_at: float  # timestamp
+
+
+# Snapshot last read by this process, so that it is only unpickled once per version
+_local_snapshot: Optional[ChainsSnapshot] = None
+
+
+def _snapshot_key(version: int) -> str:
+    # The number changes with the ChainsSnapshot format, so that snapshots
+    # cached by a previous release are not read
+    return f"chains:snapshot:3:{version}"
+
+
+def build_snapshot(version: int) -> ChainsSnapshot:
+    logger.info("Building chains snapshot. version=%d", version)
+    name_ranks = {
+        chain_id: rank
+        for rank, chain_id in enumerate(
+            Chain.objects.order_by("name", "id").values_list("id", flat=True)
+        )
+    }
+    queryset = ChainSerializer.setup_eager_loading(
+        Chain.objects.order_by("relevance", "name", "id")
+    )
+    context = {"disabled_wallets": get_disabled_wallets(name_ranks.keys())}
+
+    chains = []
+    for chain in queryset:
+        data: Optional[dict[str, Any]] = None
+        error: Optional[str] = None
+        try:
+            with track_serialization():
+                data = dict(ChainSerializer(chain, context=context).data)
+        except APIException as exception:
+            # A misconfigured chain should only fail the responses including it
+            error = str(exception.detail)
+        chains.append(
+            ChainEntry(
+                id=chain.id,
+                short_name=chain.short_name,
+                name=chain.name,
+                relevance=chain.relevance,
+                name_rank=name_ranks[chain.id],
+                data=data,
+                error=error,
+            )
+        )
+
+    return ChainsSnapshot(
+        version=version,
+        chains=chains,
+        by_id={chain.id: chain for chain in chains},
+        by_short_name={chain.short_name: chain for chain in chains},
+        built_at=time.time(),
+    )
+
+
+def _store_snapshot(snapshot: ChainsSnapshot) -> ChainsSnapshot:
+    global _local_snapshot
+    caches["default"].set(
+        _snapshot_key(snapshot.version),
+        snapshot,
+        timeout=SNAPSHOT_TIMEOUT + SNAPSHOT_STALE_TIMEOUT,
+    )
+    _local_snapshot = snapshot
+    return snapshot
+
+
+def _age(snapshot: ChainsSnapshot) -> float:
+    return time.time() - snapshot.built_at
+
+
+def _is_current(version: int) -> bool:
+    return (
+        _local_snapshot is not None
+        and _local_snapshot.version == version
+        and _age(_local_snapshot) < SNAPSHOT_TIMEOUT + SNAPSHOT_STALE_TIMEOUT
+    )
+
+
+def _load_snapshot(version: int) -> Optional[ChainsSnapshot]:
+    if _is_current(version):
+        return _local_snapshot
+    snapshot: Optional[ChainsSnapshot] = caches["default"].get(_snapshot_key(version))
+    return snapshot
+
+
+def _build_snapshot_once(version: int) -> ChainsSnapshot:
+    return _snapshot_builds.run(
+        str(version),
+        compute=lambda: _store_snapshot(build_snapshot(version)),
+        fetch=lambda: _load_snapshot(version),
+    )
+
+
+def _revalidate_snapshot(version: int) -> None:
+    global _local_snapshot
+    # Another worker may have built it again already
+    snapshot: Optional[ChainsSnapshot] = caches["default"].get(_snapshot_key(version))
+    if snapshot is not None and _age(snapshot) < SNAPSHOT_TIMEOUT:
+        _local_snapshot = snapshot
+    else:
+        _store_snapshot(build_snapshot(version))
+
+
+def get_snapshot() -> ChainsSnapshot:
+    global _local_snapshot
+    version = chains_version.get()
+    if _is_current(version):
+        assert _local_snapshot is not None
+        snapshot = _local_snapshot
+        observe_cache_lookup("chains-snapshot", hit=True)
+    else:
+        cached: Optional[ChainsSnapshot] = caches["default"].get(_snapshot_key(version))
+        observe_cache_lookup("chains-snapshot", hit=cached is not None)
+        if cached is None:
+            cached = _build_snapshot_once(version)
+        snapshot = _local_snapshot = cached
+
+    if _age(snapshot) >= SNAPSHOT_TIMEOUT:
+        # Served while it is built again
+        revalidate_in_background(
+            "chains-snapshot", str(version), lambda: _revalidate_snapshot(version)
+        )
+    return snapshot
+
+
+def refresh_snapshot() -> None:
+    """
+    Builds the snapshot of a new version, once the changes are committed. It is
+    always built, as nothing read before the commit can be adopted
+    """
+    _store_snapshot(build_snapshot(chains_version.bump()))
+
+
+def invalidate_snapshot() -> None:
+    """
+    Invalidates the current snapshot right away (so no worker keeps serving it)
+    and rebuilds it once, after the current transaction (if any) is committed
+    """
+    chains_version.bump()
+    on_commit_once(refresh_snapshot)
+
+
+def get_chains_data(chains: Sequence[ChainEntry]) -> list[dict[str, Any]]:
+    data = []
+    for chain in chains:
+        if chain.error is not None:
+            raise APIException(chain.error)
+        assert chain.data is not None
+        data.append(chain.data)
+    return data
+
+
+def sort_chains(
+    chains: Sequence[ChainEntry], ordering: Sequence[str]
+) -> list[ChainEntry]:
+    """
+    Sorts the chains using OrderingFilter terms (e.g. ["relevance", "-name"])
+    """
+    sort_keys = {
+        "relevance": lambda chain: chain.relevance,
+        "name": lambda chain: chain.name_rank,
+    }
+    sorted_chains = list(chains)
+    # Sorting is stable, so sorting by the least significant term first
+    # yields the same order as sorting by all the terms at once
+    for term in reversed(ordering):
+        field = term.lstrip("-")
+        sorted_chains.sort(key=sort_keys[field], reverse=term.startswith("-"))
+    return sorted_chains
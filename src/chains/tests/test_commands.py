@@ -0,0 +1,38 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ..models import Chain
+from .factories import ChainFactory
+
+
+class UpdateCurrencyLogoUrlsTestCase(TestCase):
+    def test_update_currency_logo_urls(self) -> None:
+        ChainFactory.create(id=1)
+        ChainFactory.create(id=2)
+        Chain.objects.filter(id=2).update(currency_logo_url="")
+        stdout = StringIO()
+
+        with override_settings(MEDIA_URL="https://assets.safe.global/"):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("update_currency_logo_urls", stdout=stdout)
+
+        self.assertEqual(
+            list(
+                Chain.objects.order_by("id").values_list("currency_logo_url", flat=True)
+            ),
+            [
+                "https://assets.safe.global/chains/1/currency_logo.jpg",
+                "https://assets.safe.global/chains/2/currency_logo.jpg",
+            ],
+        )
+        self.assertEqual(stdout.getvalue(), "Updated 2 currency logo URLs\n")
+
+    def test_unchanged_currency_logo_urls(self) -> None:
+        ChainFactory.create(id=1)
+        stdout = StringIO()
+
+        call_command("update_currency_logo_urls", stdout=stdout)
+
+        self.assertEqual(stdout.getvalue(), "Updated 0 currency logo URLs\n")
@@ -0,0 +1,82 @@
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from ..fields import to_checksum_address, validate_checksumed_address
+from ..models import Chain, GasPrice
+from .factories import ChainFactory, GasPriceFactory
+
+# https://github.com/ethereum/EIPs/blob/master/EIPS/eip-55.md#test-cases
+CHECKSUM_ADDRESSES = [
+    "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+    "0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359",
+    "0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB",
+    "0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb",
+]
+
+
+class ToChecksumAddressTestCase(SimpleTestCase):
+    def test_checksum_addresses(self) -> None:
+        for address in CHECKSUM_ADDRESSES:
+            with self.subTest(address=address):
+                self.assertEqual(to_checksum_address(address), address)
+                self.assertEqual(to_checksum_address(address.lower()), address)
+                self.assertEqual(to_checksum_address(address[2:].upper()), address)
+
+    def test_invalid_checksum_is_normalised(self) -> None:
+        address = "0x5aaeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+
+        self.assertEqual(to_checksum_address(address), CHECKSUM_ADDRESSES[0])
+
+    def test_invalid_addresses(self) -> None:
+        invalid_addresses = [
+            "0x",
+            "0xgz",
+            "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAe",
+        ]
+        for address in invalid_addresses:
+            with self.subTest(address=address):
+                with self.assertRaises(ValueError):
+                    to_checksum_address(address)
+
+    def test_validate_checksumed_address(self) -> None:
+        validate_checksumed_address(CHECKSUM_ADDRESSES[0])
+
+        for address in [
+            CHECKSUM_ADDRESSES[0].lower(),
+            # Mixed case with an invalid checksum
+            "0x5aaeb6053F3E94C9b9A09f33669435E7Ef1BeAed",
+        ]:
+            with self.subTest(address=address):
+                with self.assertRaises(ValidationError):
+                    validate_checksumed_address(address)
+
+
+class EthereumFieldsTestCase(TestCase):
+    def test_ethereum_address_is_stored_checksummed(self) -> None:
+        ChainFactory.create(id=1, ens_registry_address=CHECKSUM_ADDRESSES[0].lower())
+
+        self.assertEqual(
+            Chain.objects.values_list("ens_registry_address", flat=True).get(),
+            CHECKSUM_ADDRESSES[0],
+        )
+
+    def test_ethereum_address_with_invalid_checksum(self) -> None:
+        address = "0x5aaeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+        field = Chain._meta.get_field("ens_registry_address")
+
+        # Normalised when read or stored, as with gnosis.eth.django.models
+        self.assertEqual(field.to_python(address), CHECKSUM_ADDRESSES[0])
+        self.assertEqual(
+            field.from_db_value(address, None, None), CHECKSUM_ADDRESSES[0]
+        )
+        # But rejected by the validation of forms and serializers
+        with self.assertRaises(ValidationError):
+            field.run_validators(address)
+
+    def test_uint256_is_read_as_int(self) -> None:
+        GasPriceFactory.create(fixed_wei_value=2**256 - 1, oracle_uri=None)
+
+        fixed_wei_value = GasPrice.objects.get().fixed_wei_value
+
+        self.assertIsInstance(fixed_wei_value, int)
+        self.assertEqual(fixed_wei_value, 2**256 - 1)
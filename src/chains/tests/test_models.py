@@ -1,11 +1,14 @@
 from decimal import Decimal
+from unittest import mock
 
+import factory
 import web3
 from django.core.exceptions import ValidationError
 from django.db import DataError
 from django.test import TestCase, TransactionTestCase
 from faker import Faker
 
+from ..models import Chain, get_disabled_wallets
 from .factories import ChainFactory, FeatureFactory, GasPriceFactory, WalletFactory
 
 
@@ -272,6 +275,74 @@ class ChainCurrencyLogoTestCase(TestCase):
             chain.currency_logo_uri.url, "/media/chains/12/currency_logo.jpg"
         )
 
+    def test_currency_logo_dimensions_are_stored(self) -> None:
+        chain = ChainFactory.create(
+            currency_logo_uri=factory.django.ImageField(width=50, height=40)
+        )
+
+        chain.refresh_from_db()
+        self.assertEqual(chain.currency_logo_width, 50)
+        self.assertEqual(chain.currency_logo_height, 40)
+
+    def test_currency_logo_url_is_stored(self) -> None:
+        chain = ChainFactory.create(id=12)
+
+        chain.refresh_from_db()
+        self.assertEqual(chain.currency_logo_url, "/media/chains/12/currency_logo.jpg")
+        self.assertEqual(chain.get_currency_logo_url(), chain.currency_logo_url)
+
+    def test_currency_logo_url_is_not_resolved_again(self) -> None:
+        chain = Chain.objects.get(id=ChainFactory.create().id)
+
+        with mock.patch.object(
+            chain.currency_logo_uri.storage, "url", side_effect=AssertionError
+        ) as storage_url:
+            chain.get_currency_logo_url()
+
+        storage_url.assert_not_called()
+
+    def test_currency_logo_url_fallback(self) -> None:
+        chain = ChainFactory.create(id=12)
+        # Uploaded before the URL was stored
+        Chain.objects.filter(id=chain.id).update(currency_logo_url="")
+        chain.refresh_from_db()
+
+        self.assertEqual(
+            chain.get_currency_logo_url(), "/media/chains/12/currency_logo.jpg"
+        )
+
+    def test_unchanged_currency_logo_is_not_read(self) -> None:
+        chain = Chain.objects.get(id=ChainFactory.create().id)
+        chain.name = "Updated"
+
+        with mock.patch.object(
+            chain.currency_logo_uri.storage, "open", side_effect=AssertionError
+        ) as storage_open:
+            chain.full_clean()
+            chain.save()
+
+        storage_open.assert_not_called()
+
+    def test_stored_dimensions_are_validated(self) -> None:
+        chain = ChainFactory.create()
+        Chain.objects.filter(id=chain.id).update(currency_logo_width=513)
+        chain.refresh_from_db()
+
+        with self.assertRaises(ValidationError) as context:
+            chain.full_clean()
+
+        self.assertIn("currency_logo_uri", context.exception.message_dict)
+
+    def test_currency_logo_without_stored_dimensions(self) -> None:
+        chain = ChainFactory.create()
+        # Uploaded before the dimensions were stored
+        Chain.objects.filter(id=chain.id).update(
+            currency_logo_width=None, currency_logo_height=None
+        )
+        chain.refresh_from_db()
+
+        chain.full_clean()  # should not rise any exception
+
 
 class WalletTestCase(TestCase):
     def test_str_method_outputs_name(self) -> None:
@@ -279,6 +350,22 @@ class WalletTestCase(TestCase):
 
         self.assertEqual(str(wallet), f"Wallet: {wallet.key}")
 
+    def test_get_disabled_wallets(self) -> None:
+        chain_1 = ChainFactory.create()
+        chain_2 = ChainFactory.create()
+        WalletFactory.create(key="b", chains=())
+        WalletFactory.create(key="a", chains=(chain_1,))
+        WalletFactory.create(key="c", chains=(chain_1, chain_2))
+
+        with self.assertNumQueries(1):
+            disabled_wallets = get_disabled_wallets([chain_1.id, chain_2.id, 0])
+
+        self.assertEqual(
+            disabled_wallets,
+            {chain_1.id: ["b"], chain_2.id: ["a", "b"], 0: ["a", "b", "c"]},
+        )
+        self.assertEqual(chain_2.get_disabled_wallets(), ["a", "b"])
+
 
 class FeatureTestCase(TestCase):
     def test_str_method_outputs_name(self) -> None:
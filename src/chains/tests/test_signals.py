@@ -1,8 +1,11 @@
+from unittest import mock
+
 import responses
 from django.test import TestCase, override_settings
 
 from chains.models import Feature, Wallet
 from chains.tests.factories import ChainFactory, GasPriceFactory
+from clients.safe_client_gateway import flush_dispatcher
 
 
 @override_settings(
@@ -24,7 +27,9 @@ class ChainNetworkHookTestCase(TestCase):
             ],
         )
 
-        ChainFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChainFactory.create()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -49,10 +54,14 @@ class ChainNetworkHookTestCase(TestCase):
             ],
         )
 
-        ChainFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChainFactory.create()
+        flush_dispatcher.drain()
 
+        # Client errors are not retried
         assert len(responses.calls) == 1
 
+    @mock.patch.object(flush_dispatcher, "backoff_seconds", 0)
     @responses.activate
     def test_on_chain_update_hook_500(self) -> None:
         responses.add(
@@ -67,26 +76,41 @@ class ChainNetworkHookTestCase(TestCase):
             ],
         )
 
-        ChainFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChainFactory.create()
+        flush_dispatcher.drain()
 
-        assert len(responses.calls) == 1
+        # Server errors are retried
+        assert len(responses.calls) == flush_dispatcher.max_attempts
 
     @responses.activate
     def test_on_chain_delete_hook_call(self) -> None:
-        chain = ChainFactory.create()
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            chain = ChainFactory.create()
+        flush_dispatcher.drain()
 
-        chain.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            chain.delete()
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for deletion
         assert len(responses.calls) == 2
 
     @responses.activate
     def test_on_chain_update_hook_call(self) -> None:
-        chain = ChainFactory.create()
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            chain = ChainFactory.create()
+        flush_dispatcher.drain()
 
         # Not updating using queryset because hooks are not triggered that way
         chain.currency_name = "Ether"
-        chain.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            chain.save()
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for updating
         assert len(responses.calls) == 2
@@ -97,7 +121,9 @@ class ChainNetworkHookTestCase(TestCase):
     )
     @responses.activate
     def test_on_chain_update_with_no_cgw_set(self) -> None:
-        ChainFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChainFactory.create()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 0
 
@@ -107,7 +133,9 @@ class ChainNetworkHookTestCase(TestCase):
     )
     @responses.activate
     def test_on_chain_update_with_no_flush_token_set(self) -> None:
-        ChainFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ChainFactory.create()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 0
 
@@ -131,7 +159,9 @@ class FeatureHookTestCase(TestCase):
             ],
         )
 
-        Feature(key="Test Feature").save()
+        with self.captureOnCommitCallbacks(execute=True):
+            Feature(key="Test Feature").save()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -144,21 +174,33 @@ class FeatureHookTestCase(TestCase):
 
     @responses.activate
     def test_on_feature_delete_hook_call(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
         feature = Feature(key="Test Feature")
 
-        feature.save()  # create
-        feature.delete()  # delete
+        with self.captureOnCommitCallbacks(execute=True):
+            feature.save()  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            feature.delete()  # delete
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for deletion
         assert len(responses.calls) == 2
 
     @responses.activate
     def test_on_feature_update_hook_call(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
         feature = Feature(key="Test Feature")
 
-        feature.save()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            feature.save()  # create
+        flush_dispatcher.drain()
         feature.key = "New Test Feature"
-        feature.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            feature.save()  # update
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for updating
         assert len(responses.calls) == 2
@@ -183,7 +225,9 @@ class WalletHookTestCase(TestCase):
             ],
         )
 
-        Wallet(key="Test Wallet").save()
+        with self.captureOnCommitCallbacks(execute=True):
+            Wallet(key="Test Wallet").save()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -196,21 +240,33 @@ class WalletHookTestCase(TestCase):
 
     @responses.activate
     def test_on_wallet_delete_hook_call(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
         wallet = Wallet(key="Test Wallet")
 
-        wallet.save()  # create
-        wallet.delete()  # delete
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet.save()  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet.delete()  # delete
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for deletion
         assert len(responses.calls) == 2
 
     @responses.activate
     def test_on_wallet_update_hook_call(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
         wallet = Wallet(key="Test Wallet")
 
-        wallet.save()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet.save()  # create
+        flush_dispatcher.drain()
         wallet.key = "Test Wallet v2"
-        wallet.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet.save()  # update
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for updating
         assert len(responses.calls) == 2
@@ -240,7 +296,9 @@ class GasPriceHookTestCase(TestCase):
             ],
         )
 
-        GasPriceFactory.create(chain=self.chain)
+        with self.captureOnCommitCallbacks(execute=True):
+            GasPriceFactory.create(chain=self.chain)
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -253,20 +311,62 @@ class GasPriceHookTestCase(TestCase):
 
     @responses.activate
     def test_on_gas_price_delete_hook_call(self) -> None:
-        gas_price = GasPriceFactory.create(chain=self.chain)  # create
-        gas_price.delete()  # delete
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            gas_price = GasPriceFactory.create(chain=self.chain)  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            gas_price.delete()  # delete
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for deletion
         assert len(responses.calls) == 2
 
     @responses.activate
     def test_on_gas_price_update_hook_call(self) -> None:
-        gas_price = GasPriceFactory.create(
-            chain=self.chain, fixed_wei_value=1000
-        )  # create
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            gas_price = GasPriceFactory.create(
+                chain=self.chain, fixed_wei_value=1000
+            )  # create
+        flush_dispatcher.drain()
 
         gas_price.fixed_wei_value = 2000
-        gas_price.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            gas_price.save()  # update
+        flush_dispatcher.drain()
 
         # 2 calls: one for creation and one for updating
         assert len(responses.calls) == 2
+
+
+@override_settings(
+    CGW_URL="http://127.0.0.1",
+    CGW_FLUSH_TOKEN="example-token",
+)
+class CoalescedHookTestCase(TestCase):
+    @responses.activate
+    def test_transaction_triggers_single_hook_call(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        # eg.: a Chain saved from the admin with its inlines
+        with self.captureOnCommitCallbacks(execute=True):
+            chain = ChainFactory.create()
+            GasPriceFactory.create(chain=chain)
+            Feature(key="Test Feature").save()
+            Wallet(key="Test Wallet").save()
+        flush_dispatcher.drain()
+
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_no_hook_call_before_commit(self) -> None:
+        responses.add(responses.POST, "http://127.0.0.1/v2/flush", status=200)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            ChainFactory.create()
+        flush_dispatcher.drain()
+
+        assert len(responses.calls) == 0
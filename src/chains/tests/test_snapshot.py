@@ -0,0 +1,214 @@
+import multiprocessing
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase
+
+from config.cache import ProcessLock
+
+from ..snapshot import (
+    _revalidate_snapshot,
+    _snapshot_key,
+    build_snapshot,
+    chains_version,
+    get_snapshot,
+    refresh_snapshot,
+)
+from .factories import ChainFactory, FeatureFactory, GasPriceFactory, WalletFactory
+
+
+class ChainsSnapshotTestCase(TestCase):
+    def test_snapshot_is_built_once_per_version(self) -> None:
+        ChainFactory.create_batch(3)
+        snapshot = get_snapshot()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_snapshot(), snapshot)
+
+    def test_snapshot_order(self) -> None:
+        chain_1 = ChainFactory.create(name="bbb", relevance=1)
+        chain_2 = ChainFactory.create(name="aaa", relevance=1)
+        chain_3 = ChainFactory.create(name="aaa", relevance=0)
+
+        snapshot = get_snapshot()
+
+        self.assertEqual(
+            [chain.id for chain in snapshot.chains],
+            [chain_3.id, chain_2.id, chain_1.id],
+        )
+
+    def test_chain_update_bumps_version(self) -> None:
+        chain = ChainFactory.create(name="aaa")
+        version = get_snapshot().version
+
+        chain.name = "bbb"
+        chain.save()
+
+        snapshot = get_snapshot()
+        self.assertGreater(snapshot.version, version)
+        self.assertEqual(snapshot.by_id[chain.id].data["chain_name"], "bbb")  # type: ignore[index]
+
+    def test_relations_update_bumps_version(self) -> None:
+        chain = ChainFactory.create()
+        wallet = WalletFactory.create(chains=())
+        feature = FeatureFactory.create(chains=())
+
+        version = chains_version.get()
+        wallet.chains.add(chain)
+        self.assertGreater(chains_version.get(), version)
+
+        version = chains_version.get()
+        feature.chains.add(chain)
+        self.assertGreater(chains_version.get(), version)
+
+        version = chains_version.get()
+        GasPriceFactory.create(chain=chain)
+        self.assertGreater(chains_version.get(), version)
+
+    def test_chain_delete_bumps_version(self) -> None:
+        chain = ChainFactory.create()
+        self.assertIn(chain.id, get_snapshot().by_id)
+
+        chain.delete()
+
+        self.assertNotIn(chain.id, get_snapshot().by_id)
+
+    def test_snapshot_rebuilt_once_on_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            chain = ChainFactory.create(name="Updated")
+            GasPriceFactory.create(chain=chain)
+            WalletFactory.create(chains=(chain,))
+        self.assertEqual(callbacks.count(refresh_snapshot), 1)
+
+        refresh_snapshot()
+
+        # The snapshot built on commit is the one being served
+        with self.assertNumQueries(0):
+            snapshot = get_snapshot()
+        self.assertEqual(snapshot.version, chains_version.get())
+        self.assertEqual(snapshot.by_id[chain.id].data["chain_name"], "Updated")  # type: ignore[index]
+
+    def test_snapshot_of_the_same_version_is_rebuilt_on_commit(self) -> None:
+        chain = ChainFactory.create(name="Outdated")
+        outdated = get_snapshot()
+        with self.captureOnCommitCallbacks():
+            chain.name = "Updated"
+            chain.save()
+        # A snapshot read before the commit stored under the next version
+        version = chains_version.get() + 1
+        caches["default"].set(
+            _snapshot_key(version), outdated._replace(version=version)
+        )
+
+        refresh_snapshot()
+
+        snapshot = get_snapshot()
+        self.assertEqual(snapshot.version, version)
+        self.assertEqual(snapshot.by_id[chain.id].data["chain_name"], "Updated")  # type: ignore[index]
+
+    def test_version_is_shared_with_other_workers(self) -> None:
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        # A cache using the same location behaves as the one of another worker
+        other_worker_cache = FileBasedCache(location, {})
+        caches = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": location,
+            },
+        }
+
+        with self.settings(CACHES=caches):
+            version = chains_version.get()
+            self.assertEqual(other_worker_cache.get(chains_version.key), version)
+
+            ChainFactory.create()
+
+            self.assertGreater(other_worker_cache.get(chains_version.key), version)
+
+    def test_concurrent_bumps_are_not_lost(self) -> None:
+        version = chains_version.get()
+        # Forked workers bumping the version at the same time
+        context = multiprocessing.get_context("fork")
+        start = context.Barrier(8)
+        bumped = context.Queue()
+
+        def bump() -> None:
+            start.wait()
+            for _ in range(5):
+                bumped.put(chains_version.bump())
+
+        workers = [context.Process(target=bump) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        versions = sorted(bumped.get(timeout=10) for _ in range(8 * 5))
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(versions, list(range(version + 1, version + 8 * 5 + 1)))
+        self.assertEqual(chains_version.get(), version + 8 * 5)
+
+    def test_version_does_not_expire(self) -> None:
+        version = chains_version.bump()
+
+        with mock.patch("time.time", return_value=time.time() + 60 * 60 * 24):
+            self.assertEqual(chains_version.get(), version)
+
+    def test_snapshot_built_by_another_worker_is_awaited(self) -> None:
+        ChainFactory.create()
+        version = chains_version.get()
+        snapshot = build_snapshot(version)
+        # Another worker is building the snapshot of this version
+        lock = ProcessLock(f"single-flight:chains-snapshot:{version}")
+        lock.acquire()
+
+        def store() -> None:
+            caches["default"].set(_snapshot_key(version), snapshot)
+            lock.release()
+
+        threading.Timer(0.2, store).start()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_snapshot(), snapshot)
+
+    def test_stale_snapshot_is_served_while_rebuilt(self) -> None:
+        chain = ChainFactory.create(name="aaa")
+        snapshot = get_snapshot()
+        # Not a change the version is bumped for
+        type(chain).objects.filter(id=chain.id).update(name="bbb")
+        stale_time = time.time() + 60 * 10
+
+        with mock.patch("chains.snapshot.time.time", return_value=stale_time):
+            with mock.patch("config.cache.threading.Thread") as thread:
+                with self.assertNumQueries(0):
+                    self.assertEqual(get_snapshot(), snapshot)
+                    # Already being rebuilt
+                    self.assertEqual(get_snapshot(), snapshot)
+            thread.assert_called_once()
+            thread.return_value.start.assert_called_once()
+
+            # What the background thread does
+            _revalidate_snapshot(snapshot.version)
+            with self.assertNumQueries(0):
+                revalidated_snapshot = get_snapshot()
+
+        self.assertEqual(revalidated_snapshot.version, snapshot.version)
+        self.assertEqual(revalidated_snapshot.built_at, stale_time)
+        self.assertEqual(revalidated_snapshot.by_id[chain.id].data["chain_name"], "bbb")  # type: ignore[index]
+
+    def test_expired_snapshot_is_rebuilt(self) -> None:
+        chain = ChainFactory.create(name="aaa")
+        get_snapshot()
+        type(chain).objects.filter(id=chain.id).update(name="bbb")
+
+        with mock.patch(
+            "chains.snapshot.time.time", return_value=time.time() + 60 * 70
+        ):
+            snapshot = get_snapshot()
+
+        self.assertEqual(snapshot.by_id[chain.id].data["chain_name"], "bbb")  # type: ignore[index]
@@ -1,3 +1,4 @@
+import gzip
 from decimal import Decimal
 from typing import Any
 
@@ -145,6 +146,128 @@ class ChainPaginationViewTests(APITestCase):
         self.assertEqual(len(response.json()["results"]), 0)
 
 
+class ChainAllPaginationViewTests(APITestCase):
+    def test_all_chains(self) -> None:
+        ChainFactory.create_batch(21)
+        url = reverse("v1:chains:list") + "?limit=all"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 21)
+        self.assertEqual(response.json()["next"], None)
+        self.assertEqual(response.json()["previous"], None)
+        self.assertEqual(len(response.json()["results"]), 21)
+
+    def test_all_chains_ordering(self) -> None:
+        chain_1 = ChainFactory.create(name="aaa", relevance=2)
+        chain_2 = ChainFactory.create(name="bbb", relevance=1)
+        url = reverse("v1:chains:list") + "?limit=all&ordering=name"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        chain_ids = [result["chainId"] for result in response.json()["results"]]
+        self.assertEqual(chain_ids, [str(chain_1.id), str(chain_2.id)])
+
+
+class ChainCursorPaginationViewTests(APITestCase):
+    def _get(self, url: str) -> dict[str, Any]:
+        response = self.client.get(path=url, data=None, format="json")
+        self.assertEqual(response.status_code, 200)
+        result: dict[str, Any] = response.json()
+        return result
+
+    def test_first_page(self) -> None:
+        chains = [
+            ChainFactory.create(name="bbb", relevance=1),
+            ChainFactory.create(name="aaa", relevance=2),
+            ChainFactory.create(name="aaa", relevance=1),
+        ]
+        url = reverse("v1:chains:list") + "?cursor=&limit=2"
+
+        response = self._get(url)
+
+        self.assertEqual(set(response), {"next", "previous", "results"})
+        self.assertEqual(
+            [result["chainId"] for result in response["results"]],
+            [str(chains[2].id), str(chains[0].id)],
+        )
+        self.assertIsNotNone(response["next"])
+        self.assertIsNone(response["previous"])
+
+    def test_pages(self) -> None:
+        chains = ChainFactory.create_batch(5, relevance=1, name="Chain")
+        url = reverse("v1:chains:list") + "?cursor=&limit=2"
+
+        first_page = self._get(url)
+        second_page = self._get(first_page["next"])
+        last_page = self._get(second_page["next"])
+
+        chain_ids = [
+            result["chainId"]
+            for page in (first_page, second_page, last_page)
+            for result in page["results"]
+        ]
+        self.assertEqual(chain_ids, [str(chain.id) for chain in chains])
+        self.assertIsNone(last_page["next"])
+        self.assertEqual(self._get(last_page["previous"]), second_page)
+        self.assertEqual(self._get(second_page["previous"]), first_page)
+
+    def test_ordering_is_ignored(self) -> None:
+        chain_1 = ChainFactory.create(name="aaa", relevance=2)
+        chain_2 = ChainFactory.create(name="bbb", relevance=1)
+        url = reverse("v1:chains:list") + "?cursor=&ordering=name"
+
+        response = self._get(url)
+
+        chain_ids = [result["chainId"] for result in response["results"]]
+        self.assertEqual(chain_ids, [str(chain_2.id), str(chain_1.id)])
+
+    def test_cursor_chain_updated(self) -> None:
+        chains = ChainFactory.create_batch(3, relevance=1, name="Chain")
+        url = reverse("v1:chains:list") + "?cursor=&limit=1"
+        next_url = self._get(url)["next"]
+
+        # The chain of the cursor moves to the end of the list
+        chains[0].relevance = 2
+        chains[0].save()
+        response = self._get(next_url)
+
+        chain_ids = [result["chainId"] for result in response["results"]]
+        self.assertEqual(chain_ids, [str(chains[1].id)])
+
+    def test_previous_page_after_limit_change(self) -> None:
+        chains = ChainFactory.create_batch(5, relevance=1, name="Chain")
+        url = reverse("v1:chains:list") + "?cursor=&limit=2"
+        next_url = self._get(url)["next"].replace("limit=2", "limit=3")
+        next_page = self._get(next_url)
+
+        previous_page = self._get(next_page["previous"])
+
+        chain_ids = [result["chainId"] for result in previous_page["results"]]
+        self.assertEqual(chain_ids, [str(chains[0].id), str(chains[1].id)])
+        self.assertIsNone(previous_page["previous"])
+
+    def test_previous_page_of_deleted_cursor_chain(self) -> None:
+        chains = ChainFactory.create_batch(5, relevance=1, name="Chain")
+        url = reverse("v1:chains:list") + "?cursor=&limit=1"
+        third_page = self._get(self._get(self._get(url)["next"])["next"])
+
+        # The chain of the previous cursor is deleted
+        chains[2].delete()
+        previous_page = self._get(third_page["previous"])
+
+        chain_ids = [result["chainId"] for result in previous_page["results"]]
+        self.assertEqual(chain_ids, [str(chains[1].id)])
+
+    def test_invalid_cursor(self) -> None:
+        url = reverse("v1:chains:list") + "?cursor=invalid"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        self.assertEqual(response.status_code, 404)
+
+
 class ChainDetailViewTests(APITestCase):
     def test_json_payload_format(self) -> None:
         chain = ChainFactory.create(id=1)
@@ -488,3 +611,169 @@ class FeatureTests(APITestCase):
             response.json()["features"],
             [feature_3.key, feature_2.key, feature_1.key],
         )
+
+
+class ChainsQueryCountTests(APITestCase):
+    @staticmethod
+    def _create_chains(size: int) -> None:
+        wallet = WalletFactory.create(chains=())
+        feature = FeatureFactory.create(chains=())
+        for chain in ChainFactory.create_batch(size):
+            GasPriceFactory.create_batch(2, chain=chain)
+            wallet.chains.add(chain)
+            feature.chains.add(chain)
+        WalletFactory.create(chains=())
+
+    def test_list_query_count_does_not_depend_on_page_size(self) -> None:
+        url = reverse("v1:chains:list")
+        self._create_chains(1)
+
+        # Snapshot build: name ranking, wallets (with their chains), chains,
+        # gas prices and features
+        with self.assertNumQueries(5):
+            response = self.client.get(path=url, data=None, format="json")
+        self.assertEqual(len(response.json()["results"]), 1)
+
+        self._create_chains(19)
+
+        with self.assertNumQueries(5):
+            response = self.client.get(path=url, data=None, format="json")
+        self.assertEqual(len(response.json()["results"]), 20)
+
+    def test_snapshot_is_reused(self) -> None:
+        chain = ChainFactory.create(id=1)
+        GasPriceFactory.create_batch(3, chain=chain)
+        FeatureFactory.create_batch(3, chains=(chain,))
+        WalletFactory.create_batch(3, chains=(chain,))
+        WalletFactory.create_batch(3, chains=())
+        self.client.get(path=reverse("v1:chains:list"), data=None, format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                path=reverse("v1:chains:detail", args=[1]), data=None, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["gasPrice"]), 3)
+        self.assertEqual(len(response.json()["features"]), 3)
+        self.assertEqual(len(response.json()["disabledWallets"]), 3)
+
+
+class ChainsListViewOrderingTests(APITestCase):
+    def test_ordering_by_name(self) -> None:
+        chain_1 = ChainFactory.create(name="ccc", relevance=1)
+        chain_2 = ChainFactory.create(name="aaa", relevance=3)
+        chain_3 = ChainFactory.create(name="bbb", relevance=2)
+        url = reverse("v1:chains:list") + "?ordering=name"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        chain_ids = [result["chainId"] for result in response.json()["results"]]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(chain_ids, [str(chain_2.id), str(chain_3.id), str(chain_1.id)])
+
+    def test_descending_ordering(self) -> None:
+        chain_1 = ChainFactory.create(name="aaa", relevance=1)
+        chain_2 = ChainFactory.create(name="bbb", relevance=1)
+        chain_3 = ChainFactory.create(name="ccc", relevance=2)
+        url = reverse("v1:chains:list") + "?ordering=-relevance,-name"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        chain_ids = [result["chainId"] for result in response.json()["results"]]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(chain_ids, [str(chain_3.id), str(chain_2.id), str(chain_1.id)])
+
+    def test_invalid_ordering_is_ignored(self) -> None:
+        chain_1 = ChainFactory.create(name="aaa", relevance=2)
+        chain_2 = ChainFactory.create(name="bbb", relevance=1)
+        url = reverse("v1:chains:list") + "?ordering=short_name"
+
+        response = self.client.get(path=url, data=None, format="json")
+
+        chain_ids = [result["chainId"] for result in response.json()["results"]]
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(chain_ids, [str(chain_2.id), str(chain_1.id)])
+
+
+class ChainsETagTests(APITestCase):
+    def test_not_modified_with_matching_etag(self) -> None:
+        ChainFactory.create(id=1)
+        for url in (
+            reverse("v1:chains:list"),
+            reverse("v1:chains:detail", args=[1]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(path=url, data=None, format="json")
+                etag = response.headers["ETag"]
+
+                with self.assertNumQueries(0):
+                    not_modified_response = self.client.get(
+                        path=url, data=None, format="json", HTTP_IF_NONE_MATCH=etag
+                    )
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(not_modified_response.status_code, 304)
+                self.assertEqual(not_modified_response.content, b"")
+
+    def test_etag_changes_on_update(self) -> None:
+        chain = ChainFactory.create(id=1)
+        url = reverse("v1:chains:list")
+        etag = self.client.get(path=url, data=None, format="json").headers["ETag"]
+
+        chain.name = "Updated"
+        chain.save()
+        response = self.client.get(
+            path=url, data=None, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.json()["results"][0]["chainName"], "Updated")
+
+    def test_etag_depends_on_query(self) -> None:
+        ChainFactory.create_batch(2)
+        url = reverse("v1:chains:list")
+
+        response = self.client.get(path=url, data=None, format="json")
+        second_page_response = self.client.get(
+            path=url + "?limit=1&offset=1",
+            data=None,
+            format="json",
+            HTTP_IF_NONE_MATCH=response.headers["ETag"],
+        )
+
+        self.assertEqual(second_page_response.status_code, 200)
+        self.assertNotEqual(
+            second_page_response.headers["ETag"], response.headers["ETag"]
+        )
+
+
+class ChainsCacheControlTests(APITestCase):
+    def test_cache_control(self) -> None:
+        ChainFactory.create(id=1)
+        for url in (
+            reverse("v1:chains:list"),
+            reverse("v1:chains:detail", args=[1]),
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(path=url, data=None, format="json")
+
+                # Fresh for 10 minutes, then revalidated in the background for 1 hour
+                self.assertEqual(
+                    response.headers["Cache-Control"],
+                    "max-age=600, stale-while-revalidate=3600",
+                )
+
+    def test_compressed_responses(self) -> None:
+        ChainFactory.create_batch(3)
+        url = reverse("v1:chains:list")
+        response = self.client.get(path=url, data=None, format="json")
+
+        compressed_response = self.client.get(
+            path=url, data=None, format="json", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(compressed_response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(compressed_response.content), response.content)
+        self.assertEqual(compressed_response["ETag"], response["ETag"])
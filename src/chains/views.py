@@ -1,21 +1,52 @@
-from typing import Any
+from typing import Any, Optional
 
+from django.http import Http404
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import filters
 from rest_framework.generics import ListAPIView, RetrieveAPIView
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from config.cache import version_etag, versioned_cache_page
+
 from .models import Chain
+from .pagination import ChainsPagination
 from .serializers import ChainSerializer
+from .snapshot import (
+    SNAPSHOT_STALE_TIMEOUT,
+    SNAPSHOT_TIMEOUT,
+    ChainEntry,
+    chains_version,
+    get_chains_data,
+    get_snapshot,
+    sort_chains,
+)
+
+# Chains responses only change when the chains snapshot does
+chains_etag = etag(version_etag(chains_version))
+# Same freshness as the snapshot they are rendered from
+chains_cache_control = cache_control(
+    max_age=SNAPSHOT_TIMEOUT, stale_while_revalidate=SNAPSHOT_STALE_TIMEOUT
+)
+# Rendering them from the snapshot is cheap, but they are cached so that they
+# are compressed once
+chains_cache_page = versioned_cache_page(
+    chains_version, SNAPSHOT_TIMEOUT, cache="chains"
+)
 
 
-class ChainsPagination(LimitOffsetPagination):
-    default_limit = 20
-    max_limit = 20
+def _chain_response(chain: Optional[ChainEntry]) -> Response:
+    if chain is None:
+        raise Http404("No Chain matches the given query.")
+    return Response(get_chains_data([chain])[0])
 
 
+@method_decorator(chains_etag, name="get")
+@method_decorator(chains_cache_control, name="get")
+@method_decorator(chains_cache_page, name="get")
 class ChainsListView(ListAPIView):  # type: ignore[type-arg]
     serializer_class = ChainSerializer
     pagination_class = ChainsPagination
@@ -27,26 +58,51 @@ class ChainsListView(ListAPIView):  # type: ignore[type-arg]
         "name",
     ]
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # Chains are served from the snapshot, so the queryset is only used
+        # to validate the requested ordering. The keyset (cursor) pagination
+        # uses the default ordering of the snapshot
+        chains = get_snapshot().chains
+        if not ChainsPagination.is_cursor_pagination(request):
+            ordering = filters.OrderingFilter().get_ordering(
+                request, self.get_queryset(), self
+            )
+            chains = sort_chains(chains, ordering)
+        page = self.paginate_queryset(chains)
+        return self.get_paginated_response(get_chains_data(page or []))
+
 
 class ChainsDetailView(RetrieveAPIView):  # type: ignore[type-arg]
     serializer_class = ChainSerializer
     queryset = Chain.objects.all()
 
+    @method_decorator(chains_etag)
+    @method_decorator(chains_cache_control)
+    @method_decorator(chains_cache_page)
     @swagger_auto_schema(
         operation_id="Get chain by id"
     )  # type: ignore[misc] # Untyped decorator makes function "get" untyped
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().get(request, *args, **kwargs)
 
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return _chain_response(get_snapshot().by_id.get(kwargs["pk"]))
+
 
 class ChainsDetailViewByShortName(RetrieveAPIView):  # type: ignore[type-arg]
     lookup_field = "short_name"
     serializer_class = ChainSerializer
     queryset = Chain.objects.all()
 
+    @method_decorator(chains_etag)
+    @method_decorator(chains_cache_control)
+    @method_decorator(chains_cache_page)
     @swagger_auto_schema(
         operation_id="Get chain by shortName",
         operation_description="Warning: `shortNames` may contain characters that need to be URL encoded (i.e.: whitespaces)",  # noqa E501
     )  # type: ignore[misc] # Untyped decorator makes function "get" untyped
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         return super().get(request, *args, **kwargs)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return _chain_response(get_snapshot().by_short_name.get(kwargs["short_name"]))
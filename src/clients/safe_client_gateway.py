@@ -1,39 +1,172 @@
+import atexit
+import json as jsonlib
 import logging
+import os
+import threading
+import time
 from functools import cache
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from urllib.parse import urljoin
 
 import requests
 
+from config.metrics import observe_cgw_flush
+
 logger = logging.getLogger(__name__)
 
 
 @cache
 def setup_session() -> requests.Session:
     session = requests.Session()
-    adapter = requests.adapters.HTTPAdapter(max_retries=3)
+    # FlushDispatcher retries the failed flushes (with a backoff)
+    adapter = requests.adapters.HTTPAdapter(max_retries=0)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
 
+class FlushDispatcher:
+    """
+    Sends the CGW flush requests from a background thread.
+
+    Flushes requested within `debounce_seconds` of the first pending one are
+    coalesced into a single request per (url, token, payload). Failed requests
+    (connection errors and 5xx responses) are retried with exponential backoff.
+
+    The queued, coalesced, sent, retried and dropped flushes are counted by the
+    cgw_flushes metric (see config.metrics).
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = 1.0,
+        max_attempts: int = 5,
+        backoff_seconds: float = 1.0,
+        max_pending: int = 100,
+    ) -> None:
+        self.debounce_seconds = debounce_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._in_flight = 0
+        self._flush_now = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def enqueue(
+        self,
+        cgw_url: Optional[str],
+        cgw_flush_token: Optional[str],
+        json: Dict[str, Any],
+    ) -> None:
+        if cgw_url is None:
+            logger.error("CGW_URL is not set. Skipping hook call")
+            return
+        if cgw_flush_token is None:
+            logger.error("CGW_FLUSH_TOKEN is not set. Skipping hook call")
+            return
+
+        url = urljoin(cgw_url, "/v2/flush")
+        key = (url, cgw_flush_token, jsonlib.dumps(json, sort_keys=True))
+        with self._condition:
+            self._ensure_thread()
+            if key in self._pending:
+                observe_cgw_flush("coalesced")
+            elif len(self._pending) >= self.max_pending:
+                observe_cgw_flush("dropped")
+                logger.error("Too many pending CGW flushes. Dropping %s", json)
+            else:
+                self._pending[key] = json
+                observe_cgw_flush("queued")
+                self._condition.notify_all()
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sends the pending flushes right away (skipping the debounce window) and
+        waits until they are processed. Returns False if the timeout expired.
+        """
+        with self._condition:
+            self._flush_now = True
+            self._condition.notify_all()
+            drained = self._condition.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+            self._flush_now = False
+            return drained
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive a fork (e.g. gunicorn preloading the app),
+        # so the worker thread is (re)started by the process using it
+        if (
+            self._thread is not None
+            and self._thread.is_alive()
+            and self._pid == os.getpid()
+        ):
+            return
+        if self._pid is None:
+            atexit.register(self.drain, timeout=5)
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._run, name="cgw-flush-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: bool(self._pending))
+                deadline = time.monotonic() + self.debounce_seconds
+                while (
+                    not self._flush_now
+                    and (remaining := deadline - time.monotonic()) > 0
+                ):
+                    self._condition.wait(remaining)
+                batch, self._pending = self._pending, {}
+                self._in_flight = len(batch)
+
+            for (url, token, _), json in batch.items():
+                self._send(url, token, json)
+
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _send(self, url: str, cgw_flush_token: str, json: Dict[str, Any]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                post = setup_session().post(
+                    url,
+                    json=json,
+                    headers={"Authorization": f"Basic {cgw_flush_token}"},
+                )
+                post.raise_for_status()
+                observe_cgw_flush("sent")
+                return
+            except requests.HTTPError as error:
+                logger.error(error)
+                if error.response is not None and error.response.status_code < 500:
+                    break  # Client errors would fail again
+            except Exception as error:
+                logger.error(error)
+
+            if attempt < self.max_attempts:
+                observe_cgw_flush("retried")
+                time.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+
+        observe_cgw_flush("dropped")
+        logger.error("Could not flush CGW. Dropping %s", json)
+
+
+flush_dispatcher = FlushDispatcher()
+
+
 def flush(
     cgw_url: Optional[str], cgw_flush_token: Optional[str], json: Dict[str, Any]
 ) -> None:
-    if cgw_url is None:
-        logger.error("CGW_URL is not set. Skipping hook call")
-        return
-    if cgw_flush_token is None:
-        logger.error("CGW_FLUSH_TOKEN is not set. Skipping hook call")
-        return
-
-    url = urljoin(cgw_url, "/v2/flush")
-    try:
-        post = setup_session().post(
-            url,
-            json=json,
-            headers={"Authorization": f"Basic {cgw_flush_token}"},
-        )
-        post.raise_for_status()
-    except Exception as error:
-        logger.error(error)
+    """
+    Queues a CGW flush. It is sent (and retried) in the background, coalesced
+    with the other flushes requested in the meantime.
+    """
+    flush_dispatcher.enqueue(cgw_url, cgw_flush_token, json)
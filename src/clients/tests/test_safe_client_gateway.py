@@ -0,0 +1,124 @@
+import responses
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY
+
+from clients.safe_client_gateway import FlushDispatcher, setup_session
+
+RESULTS = ("queued", "coalesced", "sent", "retried", "dropped")
+
+
+def _sample(result: str) -> float:
+    return REGISTRY.get_sample_value("cgw_flushes_total", {"result": result}) or 0.0
+
+
+class FlushDispatcherTestCase(SimpleTestCase):
+    url = "http://127.0.0.1/v2/flush"
+
+    def setUp(self) -> None:
+        self.initial_samples = {result: _sample(result) for result in RESULTS}
+
+    def _flushes(self, result: str) -> float:
+        # Counted by this test
+        return _sample(result) - self.initial_samples[result]
+
+    @responses.activate
+    def test_flush_is_sent_in_background(self) -> None:
+        responses.add(responses.POST, self.url, status=200)
+        dispatcher = FlushDispatcher(debounce_seconds=60)
+
+        dispatcher.enqueue(
+            "http://127.0.0.1", "example-token", {"invalidate": "Chains"}
+        )
+
+        # Nothing is sent until the debounce window is over (or it is drained)
+        self.assertEqual(len(responses.calls), 0)
+        self.assertTrue(dispatcher.drain(timeout=5))
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(responses.calls[0].request.body, b'{"invalidate": "Chains"}')
+        self.assertEqual(
+            responses.calls[0].request.headers.get("Authorization"),
+            "Basic example-token",
+        )
+
+    @responses.activate
+    def test_flushes_are_coalesced(self) -> None:
+        responses.add(responses.POST, self.url, status=200)
+        dispatcher = FlushDispatcher(debounce_seconds=60)
+
+        for _ in range(3):
+            dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "Chains"})
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "SafeApps"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(self._flushes("queued"), 2)
+        self.assertEqual(self._flushes("coalesced"), 2)
+        self.assertEqual(self._flushes("sent"), 2)
+
+    @responses.activate
+    def test_server_errors_are_retried(self) -> None:
+        responses.add(responses.POST, self.url, status=503)
+        responses.add(responses.POST, self.url, status=200)
+        dispatcher = FlushDispatcher(debounce_seconds=0, backoff_seconds=0)
+
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "Chains"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertEqual(self._flushes("retried"), 1)
+        self.assertEqual(self._flushes("sent"), 1)
+        self.assertEqual(self._flushes("dropped"), 0)
+
+    @responses.activate
+    def test_flush_dropped_after_max_attempts(self) -> None:
+        responses.add(responses.POST, self.url, status=500)
+        dispatcher = FlushDispatcher(
+            debounce_seconds=0, backoff_seconds=0, max_attempts=3
+        )
+
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "Chains"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self._flushes("retried"), 2)
+        self.assertEqual(self._flushes("sent"), 0)
+        self.assertEqual(self._flushes("dropped"), 1)
+
+    @responses.activate
+    def test_client_errors_are_not_retried(self) -> None:
+        responses.add(responses.POST, self.url, status=401)
+        dispatcher = FlushDispatcher(debounce_seconds=0, backoff_seconds=0)
+
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "Chains"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self._flushes("dropped"), 1)
+
+    @responses.activate
+    def test_flush_dropped_when_too_many_pending(self) -> None:
+        responses.add(responses.POST, self.url, status=200)
+        dispatcher = FlushDispatcher(debounce_seconds=60, max_pending=1)
+
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "Chains"})
+        dispatcher.enqueue("http://127.0.0.1", "token", {"invalidate": "SafeApps"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self._flushes("dropped"), 1)
+
+    @responses.activate
+    def test_flush_skipped_without_cgw_url(self) -> None:
+        dispatcher = FlushDispatcher(debounce_seconds=0)
+
+        dispatcher.enqueue(None, "token", {"invalidate": "Chains"})
+        dispatcher.drain(timeout=5)
+
+        self.assertEqual(len(responses.calls), 0)
+        self.assertEqual(self._flushes("queued"), 0)
+
+    def test_session_does_not_retry(self) -> None:
+        # Failed flushes are only retried by the dispatcher
+        adapter = setup_session().get_adapter(self.url)
+
+        self.assertEqual(adapter.max_retries.total, 0)  # type: ignore[attr-defined]
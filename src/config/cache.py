@@ -0,0 +1,449 @@
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, transaction
+from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import (
+    get_cache_key,
+    learn_cache_key,
+    patch_cache_control,
+    patch_response_headers,
+)
+
+from config.compression import compress, encode_response
+from config.metrics import (
+    observe_cache_lookup,
+    observe_cached_responses,
+    observe_single_flight,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ProcessLock:
+    """
+    Exclusive lock shared by the processes of a node: a flock() on a file under
+    settings.CACHE_LOCKS_LOCATION. The kernel releases it if its process dies, so
+    it needs no timeout.
+
+    The file is deleted on release. A process that locked it meanwhile (through
+    the deleted file) notices that the path is not the file it locked and
+    tries again with a new file.
+    """
+
+    def __init__(self, name: str) -> None:
+        digest = hashlib.md5(name.encode(), usedforsecurity=False).hexdigest()
+        self.path = os.path.join(settings.CACHE_LOCKS_LOCATION, f"{digest}.lock")
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        os.makedirs(settings.CACHE_LOCKS_LOCATION, exist_ok=True)
+        operation = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        while True:
+            fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600)
+            try:
+                fcntl.flock(fd, operation)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            try:
+                locked_path = os.stat(self.path).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                locked_path = False
+            if locked_path:
+                self._fd = fd
+                return True
+            os.close(fd)
+
+    def release(self) -> None:
+        assert self._fd is not None, "The lock is not held"
+        # Deleted while still locked, so only by its holder
+        os.unlink(self.path)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> "ProcessLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+class ConfigVersion:
+    """
+    Monotonically increasing version of a set of configuration models.
+
+    The version lives in a cache so that every worker using that cache agrees
+    on it. If the entry is lost (eviction, cache restart) it restarts from the
+    current time in nanoseconds, so it never goes back to an already used value.
+
+    It is only set and incremented with a ProcessLock held: FileBasedCache does
+    not add() nor incr() atomically. The lock is per node, so with a cache shared
+    by several nodes the version is only as consistent as the backend incr()
+    (atomic with e.g. memcached or Redis).
+    """
+
+    def __init__(self, key: str, cache_alias: str = "default") -> None:
+        self.key = key
+        self.cache_alias = cache_alias
+
+    def _lock(self) -> ProcessLock:
+        return ProcessLock(f"version:{self.cache_alias}:{self.key}")
+
+    def get(self) -> int:
+        cache = caches[self.cache_alias]
+        version = cache.get(self.key)
+        if version is None:
+            initial_version = time.time_ns()
+            with self._lock():
+                # add() keeps the value set by another worker (if any)
+                cache.add(self.key, initial_version, timeout=None)
+                version = cache.get(self.key, initial_version)
+        return int(version)
+
+    def bump(self) -> int:
+        cache = caches[self.cache_alias]
+        with self._lock():
+            try:
+                version = int(cache.incr(self.key))
+            except ValueError:  # The version was never set (or got evicted)
+                cache.add(self.key, time.time_ns(), timeout=None)
+                version = int(cache.incr(self.key))
+            # Some backends (e.g. FileBasedCache) set the default timeout on incr()
+            cache.touch(self.key, timeout=None)
+        return version
+
+
+def request_version(version: ConfigVersion, request: HttpRequest) -> int:
+    """
+    Returns version.get(), read once per request: its ETag, its cached response
+    and the keys they depend on are all looked up for the same version
+    """
+    versions: dict[str, int] = request.__dict__.setdefault("_config_versions", {})
+    if version.key not in versions:
+        versions[version.key] = version.get()
+    return versions[version.key]
+
+
+def on_commit_once(func: Callable[[], None]) -> None:
+    """
+    Same as transaction.on_commit but func is only registered once per transaction
+    """
+    connection = transaction.get_connection()
+    if any(callback[1] == func for callback in connection.run_on_commit):
+        return
+    transaction.on_commit(func)
+
+
+_invalidations_suspended: ContextVar[bool] = ContextVar(
+    "invalidations_suspended", default=False
+)
+
+
+@contextmanager
+def suspend_invalidations() -> Iterator[None]:
+    """
+    The signal receivers do not invalidate the caches (nor flush CGW) for the
+    changes made within this context: the caller invalidates them once instead
+    """
+    token = _invalidations_suspended.set(True)
+    try:
+        yield
+    finally:
+        _invalidations_suspended.reset(token)
+
+
+def invalidations_suspended() -> bool:
+    return _invalidations_suspended.get()
+
+
+def version_etag(
+    version: ConfigVersion, key_func: Optional[Callable[[HttpRequest], str]] = None
+) -> Callable[..., str]:
+    """
+    Returns an etag_func (see django.views.decorators.http.etag) for responses
+    that only change with the given version. Nothing needs to be rendered to
+    compute it, so If-None-Match requests are answered right away.
+
+    The requests key_func (if any) returns the same key for get the same ETag
+    (see versioned_cache_page)
+    """
+
+    def etag_func(request: HttpRequest, *args: Any, **kwargs: Any) -> str:
+        # The absolute URI accounts for the query parameters and for the host
+        # (used in pagination links) of the request
+        key = request.build_absolute_uri() if key_func is None else key_func(request)
+        key_hash = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+        # Weak, as the body is the same whatever its (content) encoding
+        return f'W/"{request_version(version, request)}-{key_hash}"'
+
+    return etag_func
+
+
+_revalidating: ContextVar[bool] = ContextVar("revalidating", default=False)
+
+
+@contextmanager
+def revalidating() -> Iterator[None]:
+    """
+    The views decorated with versioned_cache_page called within this context
+    render (and cache) their responses again instead of serving the cached ones
+    """
+    token = _revalidating.set(True)
+    try:
+        yield
+    finally:
+        _revalidating.reset(token)
+
+
+def revalidate_in_background(
+    name: str, key: str, revalidate: Callable[[], None]
+) -> bool:
+    """
+    Runs revalidate in a background thread, unless it is already running for key
+    (in any worker of the node). Returns whether it was started
+    """
+    lock = ProcessLock(f"revalidate:{name}:{key}")
+    if not lock.acquire(blocking=False):
+        return False
+
+    def run() -> None:
+        try:
+            revalidate()
+        except Exception:
+            logger.exception("Could not revalidate %s. key=%s", name, key)
+        finally:
+            lock.release()
+            # Connections are per thread
+            connections.close_all()
+
+    threading.Thread(target=run, name=f"{name}-revalidation", daemon=True).start()
+    return True
+
+
+# Keys of the responses cached by this process for the current version, by cache
+_cached_keys: dict[str, tuple[str, set[str]]] = {}
+_MAX_TRACKED_KEYS = 10_000
+
+
+def _track_cached_key(cache_alias: str, key_prefix: str, cache_key: str) -> None:
+    prefix, keys = _cached_keys.get(cache_alias, ("", set()))
+    if prefix != key_prefix:
+        keys = set()
+        _cached_keys[cache_alias] = (key_prefix, keys)
+    if len(keys) < _MAX_TRACKED_KEYS:
+        keys.add(cache_key)
+    observe_cached_responses(cache_alias, len(keys))
+
+
+def _cache_response(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    cache_alias: str,
+    key_prefix: str,
+    cache_key: Optional[str],
+    timeout: int,
+    stale_timeout: int,
+) -> None:
+    # Same as django.middleware.cache.UpdateCacheMiddleware for these views
+    if (
+        not isinstance(response, HttpResponse)
+        or response.status_code != 200
+        or response.cookies
+    ):
+        return
+    patch_response_headers(response, timeout)
+    if stale_timeout:
+        patch_cache_control(response, stale_while_revalidate=stale_timeout)
+    cache = caches[cache_alias]
+
+    def store(response: HttpResponse) -> None:
+        # Once rendered, as the headers (e.g. Vary) are final
+        key = cache_key or learn_cache_key(
+            request, response, timeout + stale_timeout, key_prefix, cache=cache
+        )
+        variants = compress(response.content)
+        cache.set(key, (time.time(), response, variants), timeout + stale_timeout)
+        _track_cached_key(cache_alias, key_prefix, key)
+        encode_response(request, response, variants)
+
+    if isinstance(response, SimpleTemplateResponse):
+        response.add_post_render_callback(store)
+    else:
+        store(response)
+
+
+def versioned_cache_page(
+    version: ConfigVersion,
+    timeout: int,
+    cache: str,
+    stale_timeout: int = 0,
+    revalidate: Optional[Callable[[HttpRequest], None]] = None,
+    key_func: Optional[Callable[[HttpRequest], str]] = None,
+) -> Callable[[Callable[..., HttpResponseBase]], Callable[..., HttpResponseBase]]:
+    """
+    Same as django.views.decorators.cache.cache_page but the cache keys include
+    the given version: bumping it invalidates every cached response at once,
+    the ones of the previous versions are never read again and just expire.
+
+    The compressed variants of the responses are cached with them (see
+    config.compression) and served to the clients accepting them.
+
+    Responses are fresh for timeout seconds. Once stale, they are still served
+    for stale_timeout more seconds while revalidate(request) renders them again
+    (e.g. in the background). Cache-Control tells the clients to do the same.
+
+    Responses are keyed by their URL and the headers they vary on, unless
+    key_func is given: the requests it returns the same key for share their
+    cached response
+    """
+
+    def decorator(
+        view: Callable[..., HttpResponseBase]
+    ) -> Callable[..., HttpResponseBase]:
+        @wraps(view)
+        def wrapped_view(
+            request: HttpRequest, *args: Any, **kwargs: Any
+        ) -> HttpResponseBase:
+            if request.method not in ("GET", "HEAD"):
+                response: HttpResponseBase = view(request, *args, **kwargs)
+                return response
+
+            key_prefix = f"{version.key}:{request_version(version, request)}"
+            canonical_key = None
+            if key_func is not None:
+                request_key = key_func(request).encode()
+                canonical_key = (
+                    f"{key_prefix}:response:"
+                    f"{hashlib.md5(request_key, usedforsecurity=False).hexdigest()}"
+                )
+            if not _revalidating.get():
+                response_cache = caches[cache]
+                cache_key = canonical_key or get_cache_key(
+                    request, key_prefix, "GET", cache=response_cache
+                )
+                entry: Optional[tuple[float, HttpResponse, dict[str, bytes]]] = (
+                    None if cache_key is None else response_cache.get(cache_key)
+                )
+                observe_cache_lookup(cache, hit=entry is not None)
+                if entry is not None:
+                    stored_at, cached_response, variants = entry
+                    age = max(int(time.time() - stored_at), 0)
+                    if age >= timeout and revalidate is not None:
+                        revalidate(request)
+                    cached_response["Age"] = str(age)
+                    encode_response(request, cached_response, variants)
+                    return cached_response
+
+            response = view(request, *args, **kwargs)
+            if request.method == "GET":
+                _cache_response(
+                    request,
+                    response,
+                    cache,
+                    key_prefix,
+                    canonical_key,
+                    timeout,
+                    stale_timeout,
+                )
+            return response
+
+        return wrapped_view
+
+    return decorator
+
+
+class SingleFlight:
+    """
+    Coalesces the concurrent computations of the same (missing) cached value:
+    only one thread computes it, the others wait for it and then fetch it.
+
+    The threads of a process are coalesced with a lock per key. With
+    across_processes, the workers of the node are coalesced too: the thread
+    computing the value holds a ProcessLock and the other workers poll fetch.
+    Nobody waits more than wait seconds: the value is then computed anyway.
+    """
+
+    poll_interval = 0.05
+
+    def __init__(
+        self, name: str, across_processes: bool = False, wait: float = 5.0
+    ) -> None:
+        self.name = name
+        self.across_processes = across_processes
+        self.wait = wait
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def run(
+        self, key: str, compute: Callable[[], T], fetch: Callable[[], Optional[T]]
+    ) -> T:
+        """
+        Returns the value of key: the one fetched (once computed by another
+        thread) or the one computed. compute has to store it where fetch reads it
+        """
+        deadline = time.monotonic() + self.wait
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        if not lock.acquire(timeout=self.wait):
+            observe_single_flight(self.name, "timeout")
+            return compute()
+        try:
+            value = fetch()
+            if value is not None:
+                observe_single_flight(self.name, "coalesced")
+                return value
+            return self._run_locked(key, compute, fetch, deadline)
+        finally:
+            # Threads arriving from now on fetch the value or compute it again
+            with self._locks_lock:
+                if self._locks.get(key) is lock:
+                    del self._locks[key]
+            lock.release()
+
+    def _run_locked(
+        self,
+        key: str,
+        compute: Callable[[], T],
+        fetch: Callable[[], Optional[T]],
+        deadline: float,
+    ) -> T:
+        if not self.across_processes:
+            observe_single_flight(self.name, "computed")
+            return compute()
+
+        lock = ProcessLock(f"single-flight:{self.name}:{key}")
+        # Another worker computes it until it releases the lock
+        while not lock.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                observe_single_flight(self.name, "timeout")
+                return compute()
+            time.sleep(self.poll_interval)
+            value = fetch()
+            if value is not None:
+                observe_single_flight(self.name, "coalesced")
+                return value
+        try:
+            # It may have been computed just before the lock was released
+            value = fetch()
+            if value is not None:
+                observe_single_flight(self.name, "coalesced")
+                return value
+            observe_single_flight(self.name, "computed")
+            return compute()
+        finally:
+            lock.release()
@@ -1,3 +1,4 @@
+import gc
 import multiprocessing
 import os
 from distutils.util import strtobool
@@ -5,7 +6,64 @@ from distutils.util import strtobool
 bind = f"0.0.0.0:{os.getenv('GUNICORN_BIND_PORT', '8000')}"
 accesslog = "-"
 
-workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2))
+# The responses are mostly served from memory (see chains.snapshot and
+# safe_apps.index), so the requests are CPU bound: a sync worker per CPU (plus
+# one, to cover the few I/O waits) serves the most requests per MB of memory.
+# Threads (gthread workers) are mostly useful with slow database or cache I/O.
+# See benchmarks/workers.py to compare the combinations on a given node
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() + 1))
 threads = int(os.getenv("PYTHON_MAX_THREADS", 1))
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Workers are recycled (at different times thanks to the jitter) to bound the
+# memory they may leak. 0 disables it
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 10_000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+
+# nginx keeps up to 32 idle connections per worker to the upstream (see
+# nginx/templates/nginx.conf.template) for 60 seconds: gunicorn must keep them
+# open for longer, or nginx may send a request on a connection being closed.
+# Only used by the gthread and uvicorn workers (sync ones close every connection)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 75))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
 
 reload = bool(strtobool(os.getenv("WEB_RELOAD", "false")))
+
+# With GUNICORN_PRELOAD=true the application is loaded (and warmed up, see when_ready)
+# by the master process: the workers are forked from it and share its memory
+# (copy-on-write) instead of each importing everything again. Code changes then
+# require restarting the master (reload has no effect on the preloaded code)
+preload_app = bool(strtobool(os.getenv("GUNICORN_PRELOAD", "false")))
+
+# With GUNICORN_ASGI=true the ASGI application is served by uvicorn workers. The
+# views are sync: Django runs them in a thread shared by the requests of a worker
+if bool(strtobool(os.getenv("GUNICORN_ASGI", "false"))):
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "config.wsgi:application"
+
+
+def when_ready(server):
+    # Called in the master process before the workers are forked
+    if not preload_app:
+        return
+
+    from django.db import connections
+    from django.urls import get_resolver
+
+    # Imports every view, serializer and their dependencies
+    get_resolver().url_patterns
+    # A connection opened by the master must not be shared by the workers
+    connections.close_all()
+    # The objects loaded so far are never collected: the garbage collector of the
+    # workers does not touch (and so copy) the memory pages holding them
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    # Required by the Prometheus multiprocess mode (see config.metrics)
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
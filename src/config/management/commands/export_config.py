@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from config.transfer import export_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Exports the chains and Safe Apps configuration as a JSON document "
+        "(to be imported with import_config). Uploaded files (e.g. the currency "
+        "logos) are referenced by name but not exported."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output", "-o", help="File the document is written to (default: stdout)"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["output"] is None:
+            for chunk in export_config():
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w") as output:
+            output.writelines(export_config())
@@ -0,0 +1,39 @@
+import json
+import sys
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from config.transfer import import_config
+
+
+class Command(BaseCommand):
+    help = (
+        "Replaces the chains and Safe Apps configuration with the JSON document "
+        "created by export_config. Rows missing from the document are deleted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("input", help="File of the document ('-' for stdin)")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            if options["input"] == "-":
+                document = json.load(sys.stdin)
+            else:
+                with open(options["input"]) as input_file:
+                    document = json.load(input_file)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Could not read the document: {error}")
+
+        try:
+            counts = import_config(document)
+        except ValidationError as error:
+            raise CommandError("; ".join(error.messages))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Imported "
+                + ", ".join(f"{count} {section}" for section, count in counts.items())
+            )
+        )
@@ -0,0 +1,212 @@
+"""
+Prometheus metrics of the service.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see docker-entrypoint.sh) every gunicorn
+worker writes its samples to that directory and the scrape endpoint aggregates
+the samples of all of them.
+See https://github.com/prometheus/client_python#multiprocess-mode-eg-gunicorn
+"""
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpRequest, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+_DURATION_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time spent processing a request",
+    ["method", "route", "status"],
+    buckets=_DURATION_BUCKETS,
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Number of database queries made by a request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent by a request in database queries",
+    ["method", "route"],
+    buckets=_DURATION_BUCKETS,
+)
+REQUEST_SERIALIZATION_DURATION = Histogram(
+    "http_request_serialization_duration_seconds",
+    "Time spent by a request serializing models and rendering JSON",
+    ["method", "route"],
+    buckets=_DURATION_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups",
+    "Lookups of the caches of the service",
+    ["cache", "result"],
+)
+CACHED_RESPONSES = Gauge(
+    "cached_responses",
+    "Distinct responses cached by a worker for the current version (the maximum across workers)",
+    ["cache"],
+    multiprocess_mode="max",
+)
+SINGLE_FLIGHT = Counter(
+    "single_flight_computations",
+    "Computations of cached values requested concurrently (see config.cache.SingleFlight)",
+    ["name", "result"],
+)
+CGW_FLUSHES = Counter(
+    "cgw_flushes",
+    "Safe Client Gateway flushes (see clients.safe_client_gateway.FlushDispatcher)",
+    ["result"],
+)
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_duration: float = 0.0
+    serialization_duration: float = 0.0
+
+
+# Stats of the request being processed (if any) by the current thread/task.
+# Context variables are also seen by the threads running the sync code of an
+# async request (see asgiref.sync.sync_to_async)
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+def _track_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_queries += 1
+        stats.db_duration += time.perf_counter() - start
+
+
+def install_query_tracker(connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    if _track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_query)
+
+
+# Every thread has its own database connections
+connection_created.connect(install_query_tracker)
+
+
+@contextmanager
+def track_request() -> Iterator[RequestStats]:
+    """
+    Collects the stats of the request processed within the block
+    """
+    # In case the connection of this thread was created before this module was imported
+    install_query_tracker(connection)
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+@contextmanager
+def track_serialization() -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.serialization_duration += time.perf_counter() - start
+
+
+def observe_request(
+    method: str, route: str, status: int, duration: float, stats: RequestStats
+) -> None:
+    REQUEST_DURATION.labels(method, route, status).observe(duration)
+    REQUEST_DB_QUERIES.labels(method, route).observe(stats.db_queries)
+    REQUEST_DB_DURATION.labels(method, route).observe(stats.db_duration)
+    REQUEST_SERIALIZATION_DURATION.labels(method, route).observe(
+        stats.serialization_duration
+    )
+
+
+def observe_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_cached_responses(cache: str, count: int) -> None:
+    CACHED_RESPONSES.labels(cache).set(count)
+
+
+def observe_single_flight(name: str, result: str) -> None:
+    SINGLE_FLIGHT.labels(name, result).inc()
+
+
+def observe_cgw_flush(result: str) -> None:
+    CGW_FLUSHES.labels(result).inc()
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Exposes the metrics in the Prometheus text format to the scrapes with the
+    settings.METRICS_TOKEN bearer token. Without it, there is no such endpoint
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    authorization = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(
+        authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()
+    ):
+        response = HttpResponse(status=401)
+        response["WWW-Authenticate"] = "Bearer"
+        return response
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -1,35 +1,61 @@
+import asyncio
 import logging
 import time
 
 from django.http import HttpRequest
 
+from config.metrics import RequestStats, observe_request, track_request
+
 
 class LoggingMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
         self.logger = logging.getLogger("LoggingMiddleware")
-
-    @staticmethod
-    def get_milliseconds_now():
-        return int(time.time() * 1000)
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Marks the middleware as async (like django.utils.deprecation.MiddlewareMixin)
+            # so that async views are not run in a thread
+            self._is_coroutine = asyncio.coroutines._is_coroutine
 
     def __call__(self, request: HttpRequest):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
         # before view (and other middleware) are called
-        milliseconds = self.get_milliseconds_now()
+        start = time.perf_counter()
 
-        response = self.get_response(request)
+        with track_request() as stats:
+            response = self.get_response(request)
 
         # after view is called
+        self.log_request(request, response, time.perf_counter() - start, stats)
+        return response
+
+    async def __acall__(self, request: HttpRequest):
+        start = time.perf_counter()
+
+        with track_request() as stats:
+            response = await self.get_response(request)
+
+        self.log_request(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def log_request(
+        self, request: HttpRequest, response, duration: float, stats: RequestStats
+    ) -> None:
+        # Unresolved paths are not used as labels, to bound the number of series
+        route = request.resolver_match.route if request.resolver_match else "unmatched"
+        observe_request(
+            request.method or "", route, response.status_code, duration, stats
+        )
         if request.resolver_match:
-            route = (
-                request.resolver_match.route if request.resolver_match else request.path
-            )
             self.logger.info(
                 "MT::%s::%s::%s::%d::%s",
                 request.method,
                 route,
-                self.get_milliseconds_now() - milliseconds,
+                int(duration * 1000),
                 response.status_code,
                 request.path,
             )
-        return response
@@ -0,0 +1,67 @@
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.util import camelize_re, underscore_to_camel
+from rest_framework.renderers import JSONRenderer
+
+from config.metrics import track_serialization
+
+# Upper bound of the cached key sets, in case some payload uses arbitrary keys
+MAX_CACHED_KEY_SETS = 1024
+
+_camel_keys: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+
+def _camelize_key(key: Any) -> Any:
+    if isinstance(key, Promise):
+        key = force_str(key)
+    if isinstance(key, str) and "_" in key:
+        return camelize_re.sub(underscore_to_camel, key)
+    return key
+
+
+def camelize(data: Any) -> Any:
+    """
+    Same as djangorestframework_camel_case.util.camelize (without options).
+
+    The camelCase keys are computed once per set of keys (i.e. once per
+    serializer) instead of once per key of every rendered object, and plain
+    dicts are returned since only the JSON encoding of the result is used.
+    """
+    if data is None or isinstance(data, (str, int, float, Decimal)):
+        return data
+    if isinstance(data, Promise):
+        return force_str(data)
+    if isinstance(data, dict):
+        keys = tuple(data)
+        camel_keys = _camel_keys.get(keys)
+        if camel_keys is None:
+            camel_keys = tuple(_camelize_key(key) for key in keys)
+            if len(_camel_keys) < MAX_CACHED_KEY_SETS:
+                _camel_keys[keys] = camel_keys
+        return dict(zip(camel_keys, map(camelize, data.values())))
+    if isinstance(data, (list, tuple)):
+        return [camelize(item) for item in data]
+    try:
+        items = iter(data)
+    except TypeError:
+        return data
+    return [camelize(item) for item in items]
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement of djangorestframework_camel_case.render.CamelCaseJSONRenderer
+    rendering the exact same bytes
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Dict[str, Any]] = None,
+    ) -> bytes:
+        with track_serialization():
+            return super().render(camelize(data), accepted_media_type, renderer_context)
@@ -0,0 +1,130 @@
+import hashlib
+import logging
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_yasg.renderers import _SpecRenderer
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+from rest_framework.request import Request
+
+from config.compression import compress, encode_response
+from config.metrics import observe_cache_lookup
+from version import __version__
+
+logger = logging.getLogger(__name__)
+
+# Artifacts only change with the release, but each node only needs the few
+# built for the hosts it is reached through
+_MAX_LOCAL_ARTIFACTS = 16
+
+# The cached artifacts are keyed by the host of the requests (which may be any
+# host if ALLOWED_HOSTS has a wildcard): they expire instead of piling up
+_ARTIFACT_TIMEOUT = 60 * 60 * 24
+
+
+class SchemaArtifact(NamedTuple):
+    content_type: str
+    content: bytes
+    etag: str
+    # Compressed variants of content, by encoding
+    variants: dict[str, bytes]
+
+
+# Artifacts built (or read from the cache) by this process
+_local_artifacts: dict[str, SchemaArtifact] = {}
+
+
+def _artifact_key(request: HttpRequest, renderer: _SpecRenderer, version: str) -> str:
+    # The document includes the host, scheme and script prefix of the request
+    base_uri = request.build_absolute_uri("/").encode()
+    return (
+        f"swagger:2:{__version__}:{version}:{renderer.format}:"
+        f"{hashlib.md5(base_uri, usedforsecurity=False).hexdigest()}"
+    )
+
+
+_BaseSchemaView = get_schema_view(
+    validators=["flex", "ssv"],
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)
+
+
+class SchemaView(_BaseSchemaView):  # type: ignore[misc,valid-type]
+    """
+    Serves the OpenAPI document from an artifact built (and validated) once per
+    release, instead of introspecting every view on each request.
+
+    The artifacts are kept in memory and in the default cache (shared by the
+    workers of a node). With DEBUG they are only kept in memory, as the code
+    changes without the release being bumped.
+    """
+
+    def get(
+        self, request: Request, version: str = "", format: Optional[str] = None
+    ) -> HttpResponse:
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, _SpecRenderer):
+            # The web UI does not include any endpoint: it loads the document
+            # with ?format=openapi
+            return super().get(request, version, format)  # type: ignore[no-any-return]
+
+        version = request.version or version or ""
+        artifact = self.get_artifact(request, renderer, version)
+        response = get_conditional_response(request, etag=artifact.etag)
+        if response is None:
+            response = HttpResponse(
+                artifact.content, content_type=artifact.content_type
+            )
+            encode_response(request, response, artifact.variants)
+        response["ETag"] = artifact.etag
+        # Clients revalidate the document (with If-None-Match) on every use
+        patch_cache_control(response, no_cache=True)
+        return response
+
+    def get_artifact(
+        self, request: Request, renderer: _SpecRenderer, version: str
+    ) -> SchemaArtifact:
+        key = _artifact_key(request, renderer, version)
+        artifact = _local_artifacts.get(key)
+        if artifact is not None:
+            observe_cache_lookup("swagger-schema", hit=True)
+            return artifact
+
+        if not settings.DEBUG:
+            artifact = caches["default"].get(key)
+        observe_cache_lookup("swagger-schema", hit=artifact is not None)
+        if artifact is None:
+            artifact = self.build_artifact(request, renderer, version)
+            if not settings.DEBUG:
+                caches["default"].set(key, artifact, timeout=_ARTIFACT_TIMEOUT)
+
+        if len(_local_artifacts) >= _MAX_LOCAL_ARTIFACTS:
+            _local_artifacts.clear()
+        _local_artifacts[key] = artifact
+        return artifact
+
+    def build_artifact(
+        self, request: Request, renderer: _SpecRenderer, version: str
+    ) -> SchemaArtifact:
+        logger.info("Building OpenAPI document. format=%s", renderer.format)
+        response = super().get(request, version)
+        # The validators run when the document is rendered
+        content: bytes = renderer.render(
+            response.data, renderer.media_type, self.get_renderer_context()
+        )
+        # Weak, as the body is the same whatever its (content) encoding
+        etag = f'W/"{hashlib.md5(content, usedforsecurity=False).hexdigest()}"'
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        return SchemaArtifact(
+            content_type=content_type,
+            content=content,
+            etag=etag,
+            variants=compress(content),
+        )
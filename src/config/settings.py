@@ -39,7 +39,7 @@ ALLOWED_HOSTS = [allowed_host.strip() for allowed_host in allowed_hosts.split(",
 REST_FRAMEWORK = {
     # https://www.django-rest-framework.org/api-guide/renderers/
     "DEFAULT_RENDERER_CLASSES": [
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        "config.renderers.CamelCaseJSONRenderer",
     ],
     "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
 }
@@ -49,6 +49,8 @@ INSTALLED_APPS = [
     "about.apps.AboutAppConfig",
     "chains.apps.AppsConfig",
     "safe_apps.apps.AppsConfig",
+    # Management commands (see config.transfer)
+    "config",
     "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
@@ -71,12 +73,34 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# By default the file based cache is used: its contents (and invalidations) are
+# shared by every gunicorn worker running on the same node. The per process
+# django.core.cache.backends.locmem.LocMemCache can still be set for development.
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+CACHE_LOCATION = os.getenv("CACHE_LOCATION", "/tmp/safe-config-service/cache")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10_000))
+# Lock files of the workers of a node (see config.cache.ProcessLock): add() and
+# incr() of FileBasedCache are a read then a write, so they are not atomic
+CACHE_LOCKS_LOCATION = f"{CACHE_LOCATION}/locks"
+
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": f"{CACHE_LOCATION}/default",
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
     },
     "safe-apps": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": f"{CACHE_LOCATION}/safe-apps",
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+    },
+    "chains": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": f"{CACHE_LOCATION}/chains",
+        "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
     },
 }
 
@@ -199,6 +223,17 @@ SWAGGER_SETTINGS = {
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_URLS_REGEX = r"^/api/.*$"
 
+# Default and maximum page size of the chains list (see chains.pagination)
+CHAINS_PAGE_SIZE = int(os.getenv("CHAINS_PAGE_SIZE", 20))
+CHAINS_MAX_PAGE_SIZE = int(os.getenv("CHAINS_MAX_PAGE_SIZE", 20))
+
+# Number of the most requested Safe Apps responses rendered again (in the
+# background) after a change, before they are requested (see safe_apps.cache)
+SAFE_APPS_CACHE_WARM_SIZE = int(os.getenv("SAFE_APPS_CACHE_WARM_SIZE", 20))
+
+# Bearer token of the /metrics/ scrapes (see config.metrics). Disabled if not set
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
 CGW_URL = os.environ.get("CGW_URL")
 CGW_FLUSH_TOKEN = os.environ.get("CGW_FLUSH_TOKEN")
 
@@ -0,0 +1,233 @@
+import multiprocessing
+import os
+import threading
+from typing import Optional
+
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY
+
+from ..cache import ProcessLock, SingleFlight, revalidate_in_background
+
+
+class ProcessLockTestCase(SimpleTestCase):
+    def test_lock_is_exclusive(self) -> None:
+        lock = ProcessLock("test-lock")
+        other_lock = ProcessLock("test-lock")
+
+        self.assertTrue(lock.acquire(blocking=False))
+        self.assertFalse(other_lock.acquire(blocking=False))
+        lock.release()
+        self.assertTrue(other_lock.acquire(blocking=False))
+        other_lock.release()
+
+        self.assertFalse(os.path.exists(lock.path))
+
+    def test_lock_of_dead_process_is_released(self) -> None:
+        def hold_lock() -> None:
+            ProcessLock("test-dead-process").acquire()
+            os._exit(0)  # Without releasing it
+
+        worker = multiprocessing.get_context("fork").Process(target=hold_lock)
+        worker.start()
+        worker.join()
+
+        lock = ProcessLock("test-dead-process")
+        self.assertTrue(lock.acquire(blocking=False))
+        lock.release()
+
+
+class SingleFlightTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.values: dict[str, str] = {}
+        self.computations = 0
+
+    @staticmethod
+    def _sample(name: str, result: str) -> float:
+        return (
+            REGISTRY.get_sample_value(
+                "single_flight_computations_total", {"name": name, "result": result}
+            )
+            or 0.0
+        )
+
+    def _compute(self, key: str, started: Optional[threading.Event] = None) -> str:
+        self.computations += 1
+        if started is not None:
+            started.set()
+            # Lets the other threads wait for this computation
+            threading.Event().wait(0.2)
+        self.values[key] = f"value of {key}"
+        return self.values[key]
+
+    def test_concurrent_computations_are_coalesced(self) -> None:
+        single_flight = SingleFlight("test-threads")
+        coalesced = self._sample("test-threads", "coalesced")
+        started = threading.Event()
+        results: list[str] = []
+
+        def run(started: Optional[threading.Event]) -> None:
+            results.append(
+                single_flight.run(
+                    "key",
+                    compute=lambda: self._compute("key", started),
+                    fetch=lambda: self.values.get("key"),
+                )
+            )
+
+        leader = threading.Thread(target=run, args=(started,))
+        leader.start()
+        started.wait()
+        followers = [threading.Thread(target=run, args=(None,)) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader, *followers]:
+            thread.join()
+
+        self.assertEqual(self.computations, 1)
+        self.assertEqual(results, ["value of key"] * 5)
+        self.assertEqual(self._sample("test-threads", "coalesced"), coalesced + 4)
+        self.assertEqual(single_flight._locks, {})
+
+    def test_failed_computation_is_retried(self) -> None:
+        single_flight = SingleFlight("test-failure")
+
+        def fail() -> str:
+            raise ValueError("Cannot compute")
+
+        with self.assertRaises(ValueError):
+            single_flight.run("key", compute=fail, fetch=lambda: None)
+
+        self.assertEqual(
+            single_flight.run(
+                "key",
+                compute=lambda: self._compute("key"),
+                fetch=lambda: self.values.get("key"),
+            ),
+            "value of key",
+        )
+        self.assertEqual(self.computations, 1)
+
+    def _hold_lock(self, name: str) -> None:
+        # As another worker computing the value
+        lock = ProcessLock(f"single-flight:{name}:key")
+        lock.acquire()
+        self.addCleanup(lock.release)
+
+    def test_waits_for_other_workers(self) -> None:
+        single_flight = SingleFlight("test-workers", across_processes=True)
+        coalesced = self._sample("test-workers", "coalesced")
+        self._hold_lock("test-workers")
+        threading.Timer(0.2, self._compute, args=("key",)).start()
+
+        value = single_flight.run(
+            "key",
+            compute=lambda: "value computed twice",
+            fetch=lambda: self.values.get("key"),
+        )
+
+        self.assertEqual(value, "value of key")
+        self.assertEqual(self._sample("test-workers", "coalesced"), coalesced + 1)
+
+    def test_computes_after_waiting_too_long(self) -> None:
+        single_flight = SingleFlight("test-timeout", across_processes=True, wait=0.2)
+        timeouts = self._sample("test-timeout", "timeout")
+        # Another worker never computes it
+        self._hold_lock("test-timeout")
+
+        value = single_flight.run(
+            "key",
+            compute=lambda: self._compute("key"),
+            fetch=lambda: self.values.get("key"),
+        )
+
+        self.assertEqual(value, "value of key")
+        self.assertEqual(self._sample("test-timeout", "timeout"), timeouts + 1)
+
+    def test_lock_is_released(self) -> None:
+        single_flight = SingleFlight("test-lock", across_processes=True)
+
+        single_flight.run(
+            "key",
+            compute=lambda: self._compute("key"),
+            fetch=lambda: self.values.get("key"),
+        )
+
+        self.assertFalse(
+            os.path.exists(ProcessLock("single-flight:test-lock:key").path)
+        )
+        self.assertEqual(self._sample("test-lock", "computed"), 1)
+
+    def test_concurrent_processes_are_coalesced(self) -> None:
+        single_flight = SingleFlight("test-processes", across_processes=True)
+        cache = caches["default"]
+        keys = [f"key-{index}" for index in range(5)]
+        context = multiprocessing.get_context("fork")
+        start = context.Barrier(8)
+        computations = context.Value("i", 0)
+        results = context.Queue()
+
+        def compute(key: str) -> str:
+            with computations.get_lock():
+                computations.value += 1
+            # Lets the other workers wait for this computation
+            threading.Event().wait(0.1)
+            cache.set(f"test-processes:{key}", f"value of {key}")
+            return f"value of {key}"
+
+        def run() -> None:
+            for key in keys:
+                start.wait()
+                value = single_flight.run(
+                    key,
+                    compute=lambda: compute(key),
+                    fetch=lambda: cache.get(f"test-processes:{key}"),
+                )
+                results.put(value)
+
+        workers = [context.Process(target=run) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        values = [results.get(timeout=10) for _ in range(len(keys) * 8)]
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(
+            sorted(values), sorted([f"value of {key}" for key in keys] * 8)
+        )
+        self.assertEqual(computations.value, len(keys))
+
+
+class RevalidateInBackgroundTestCase(SimpleTestCase):
+    def test_one_revalidation_per_key_across_processes(self) -> None:
+        context = multiprocessing.get_context("fork")
+        start = context.Barrier(8)
+        results = context.Queue()
+
+        def run() -> None:
+            start.wait()
+            started = revalidate_in_background(
+                "test", "key", lambda: threading.Event().wait(0.5)
+            )
+            results.put(started)
+            if started:  # The revalidation thread dies with its process
+                threading.Event().wait(0.6)
+
+        workers = [context.Process(target=run) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        started = [results.get(timeout=10) for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(started.count(True), 1)
+
+    def test_revalidation_runs_again_once_done(self) -> None:
+        done = threading.Event()
+
+        self.assertTrue(revalidate_in_background("test", "done", done.set))
+        done.wait(1)
+        # Released right after revalidate returns
+        threading.Event().wait(0.1)
+
+        self.assertTrue(revalidate_in_background("test", "done", lambda: None))
@@ -0,0 +1,48 @@
+import gzip
+
+import brotli
+from django.test import RequestFactory, SimpleTestCase
+
+from ..compression import MIN_LENGTH, compress, select_encoding
+
+CONTENT = b'{"name": "Safe App"}' * 100
+
+
+class CompressTestCase(SimpleTestCase):
+    def test_variants(self) -> None:
+        variants = compress(CONTENT)
+
+        self.assertEqual(brotli.decompress(variants["br"]), CONTENT)
+        self.assertEqual(gzip.decompress(variants["gzip"]), CONTENT)
+
+    def test_small_content_is_not_compressed(self) -> None:
+        self.assertEqual(compress(CONTENT[: MIN_LENGTH - 1]), {})
+
+
+class SelectEncodingTestCase(SimpleTestCase):
+    def test_select_encoding(self) -> None:
+        cases = [
+            ("", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("br;q=0, gzip;q=0", None),
+            ("*", "br"),
+            ("*;q=0.1, gzip;q=0.5", "gzip"),
+            ("*, br;q=0", "gzip"),
+            ("GZIP;q=invalid, identity", None),
+            ("deflate", None),
+        ]
+        for accept_encoding, encoding in cases:
+            with self.subTest(accept_encoding=accept_encoding):
+                request = RequestFactory().get(
+                    "/", HTTP_ACCEPT_ENCODING=accept_encoding
+                )
+
+                self.assertEqual(select_encoding(request, ["gzip", "br"]), encoding)
+
+    def test_only_available_encodings(self) -> None:
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br, gzip")
+
+        self.assertEqual(select_encoding(request, ["gzip"]), "gzip")
+        self.assertIsNone(select_encoding(request, []))
@@ -0,0 +1,117 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from chains.tests.factories import ChainFactory
+
+
+class MetricsTestCase(TestCase):
+    @staticmethod
+    def _sample(name: str, **labels: str) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    def test_request_metrics(self) -> None:
+        ChainFactory.create_batch(2)
+        route = "api/v1/chains/"
+        requests = self._sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route=route,
+            status="200",
+        )
+        queries = self._sample("http_request_db_queries_sum", method="GET", route=route)
+        misses = self._sample(
+            "cache_lookups_total", cache="chains-snapshot", result="miss"
+        )
+        hits = self._sample(
+            "cache_lookups_total", cache="chains-snapshot", result="hit"
+        )
+
+        self.client.get(reverse("v1:chains:list"))
+        # Another page, not served from the cached responses
+        self.client.get(reverse("v1:chains:list") + "?limit=1")
+
+        self.assertEqual(
+            self._sample(
+                "http_request_duration_seconds_count",
+                method="GET",
+                route=route,
+                status="200",
+            ),
+            requests + 2,
+        )
+        # The snapshot is only built by the first request
+        self.assertEqual(
+            self._sample("http_request_db_queries_sum", method="GET", route=route),
+            queries + 5,
+        )
+        self.assertGreater(
+            self._sample(
+                "http_request_serialization_duration_seconds_sum",
+                method="GET",
+                route=route,
+            ),
+            0,
+        )
+        self.assertEqual(
+            self._sample("cache_lookups_total", cache="chains-snapshot", result="miss"),
+            misses + 1,
+        )
+        self.assertEqual(
+            self._sample("cache_lookups_total", cache="chains-snapshot", result="hit"),
+            hits + 1,
+        )
+
+    def test_unmatched_route(self) -> None:
+        requests = self._sample(
+            "http_request_duration_seconds_count",
+            method="GET",
+            route="unmatched",
+            status="404",
+        )
+
+        self.client.get("/unknown/path/")
+
+        self.assertEqual(
+            self._sample(
+                "http_request_duration_seconds_count",
+                method="GET",
+                route="unmatched",
+                status="404",
+            ),
+            requests + 1,
+        )
+
+    @override_settings(METRICS_TOKEN="metrics-token")
+    def test_metrics_endpoint(self) -> None:
+        self.client.get(reverse("v1:chains:list"))
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer metrics-token"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(
+            b'http_request_duration_seconds_bucket{le="0.0005",method="GET",'
+            b'route="api/v1/chains/",status="200"}',
+            response.content,
+        )
+
+    @override_settings(METRICS_TOKEN="metrics-token")
+    def test_metrics_endpoint_requires_the_token(self) -> None:
+        for authorization in ("", "Bearer other-token", "Basic metrics-token"):
+            with self.subTest(authorization=authorization):
+                response = self.client.get(
+                    reverse("metrics"), HTTP_AUTHORIZATION=authorization
+                )
+
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response["WWW-Authenticate"], "Bearer")
+                self.assertNotIn(b"http_request_duration_seconds", response.content)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_metrics_endpoint_disabled_without_token(self) -> None:
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 404)
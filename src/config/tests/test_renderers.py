@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as LibraryCamelCaseJSONRenderer,
+)
+from rest_framework.test import APITestCase
+
+from chains.tests.factories import (
+    ChainFactory,
+    FeatureFactory,
+    GasPriceFactory,
+    WalletFactory,
+)
+from config.renderers import CamelCaseJSONRenderer
+
+
+class CamelCaseJSONRendererTests(SimpleTestCase):
+    def assertRendersLikeLibrary(self, data: Any) -> None:
+        self.assertEqual(
+            CamelCaseJSONRenderer().render(data),
+            LibraryCamelCaseJSONRenderer().render(data),
+        )
+
+    def test_nested_keys(self) -> None:
+        self.assertRendersLikeLibrary(
+            {
+                "chain_id": "1",
+                "rpc_uri": OrderedDict(
+                    [("authentication", "API_KEY_PATH"), ("value", "https://rpc")]
+                ),
+                "gas_price": [
+                    {"oracle_parameter": "fast", "gwei_factor": Decimal("1.5")}
+                ],
+                "disabled_wallets": ("wallet_a", "wallet_b"),
+                "features": set(),
+                "ens_registry_address": None,
+                "is_testnet": False,
+            }
+        )
+
+    def test_special_keys(self) -> None:
+        self.assertRendersLikeLibrary(
+            {
+                "_private": 1,
+                "trailing_": 2,
+                "double__underscore": 3,
+                "number_1_key": 4,
+                "UPPER_CASE": 5,
+                "a_b": 6,
+                "aB": 7,
+                1: 8,
+                gettext_lazy("lazy_key"): gettext_lazy("lazy_value"),
+            }
+        )
+
+    def test_same_keys_different_values(self) -> None:
+        self.assertRendersLikeLibrary(
+            [{"chain_id": index, "chain_name": str(index)} for index in range(3)]
+        )
+
+    def test_scalars(self) -> None:
+        for data in [None, "snake_case", 1, 1.5, True, [], {}]:
+            with self.subTest(data=data):
+                self.assertRendersLikeLibrary(data)
+
+
+class CamelCaseJSONRendererChainsTests(APITestCase):
+    def test_chains_page_is_unchanged(self) -> None:
+        WalletFactory.create_batch(2)
+        for chain in ChainFactory.create_batch(3):
+            GasPriceFactory.create(chain=chain)
+            FeatureFactory.create().chains.add(chain)
+
+        response = self.client.get(reverse("v1:chains:list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.content, LibraryCamelCaseJSONRenderer().render(response.data)
+        )
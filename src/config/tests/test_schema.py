@@ -0,0 +1,102 @@
+import gzip
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from config import schema
+from config.schema import SchemaView
+
+
+class SchemaViewTests(APITestCase):
+    def test_document_is_built_once(self) -> None:
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        with self.assertLogs("config.schema") as logs:
+            response = self.client.get(url)
+            second_response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        self.assertIn("/chains/", response.json()["paths"])
+        self.assertEqual(response.json()["host"], "testserver")
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertEqual(second_response.content, response.content)
+        self.assertEqual(second_response["ETag"], response["ETag"])
+        self.assertEqual(len(logs.records), 1)
+
+    def test_document_is_read_from_the_cache(self) -> None:
+        url = reverse("schema-json", kwargs={"format": ".json"})
+        response = self.client.get(url)
+        # Another worker, which did not build the document
+        schema._local_artifacts.clear()
+
+        with mock.patch.object(SchemaView, "build_artifact") as build_artifact:
+            cached_response = self.client.get(url)
+
+        self.assertEqual(cached_response.content, response.content)
+        build_artifact.assert_not_called()
+
+    def test_cached_document_expires(self) -> None:
+        self.client.get(reverse("schema-json", kwargs={"format": ".json"}))
+        key = next(iter(schema._local_artifacts))
+        self.assertIsNotNone(caches["default"].get(key))
+
+        with mock.patch("time.time", return_value=time.time() + 60 * 60 * 24):
+            self.assertIsNone(caches["default"].get(key))
+
+    @override_settings(DEBUG=True)
+    def test_document_is_not_cached_with_debug(self) -> None:
+        self.client.get(reverse("schema-json", kwargs={"format": ".json"}))
+
+        self.assertEqual(len(schema._local_artifacts), 1)
+        self.assertFalse(
+            caches["default"].get(next(iter(schema._local_artifacts)), False)
+        )
+
+    def test_not_modified(self) -> None:
+        url = reverse("schema-json", kwargs={"format": ".json"})
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_document_per_host(self) -> None:
+        url = reverse("schema-json", kwargs={"format": ".json"})
+
+        response = self.client.get(url)
+        other_host_response = self.client.get(url, HTTP_HOST="localhost")
+
+        self.assertEqual(other_host_response.json()["host"], "localhost")
+        self.assertNotEqual(other_host_response["ETag"], response["ETag"])
+
+    def test_ui_loads_the_cached_document(self) -> None:
+        url = reverse("schema-swagger-ui")
+
+        ui_response = self.client.get(url)
+        response = self.client.get(url, {"format": "openapi"})
+
+        self.assertEqual(ui_response.status_code, 200)
+        self.assertEqual(ui_response["Content-Type"], "text/html; charset=utf-8")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "application/openapi+json; charset=utf-8"
+        )
+        self.assertIn("ETag", response)
+
+    def test_compressed_document(self) -> None:
+        url = reverse("schema-json", kwargs={"format": ".json"})
+        response = self.client.get(url)
+
+        compressed_response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(compressed_response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed_response["Vary"])
+        self.assertEqual(gzip.decompress(compressed_response.content), response.content)
+        self.assertEqual(compressed_response["ETag"], response["ETag"])
@@ -0,0 +1,251 @@
+import json
+import tempfile
+from io import StringIO
+from typing import Any
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from chains.models import Chain, Feature, GasPrice, Wallet
+from chains.tests.factories import (
+    ChainFactory,
+    FeatureFactory,
+    GasPriceFactory,
+    WalletFactory,
+)
+from config.transfer import export_config, import_config
+from safe_apps.models import Client, Provider, SafeApp, Tag
+from safe_apps.tests.factories import (
+    ClientFactory,
+    ProviderFactory,
+    SafeAppFactory,
+    TagFactory,
+)
+
+
+def _export() -> dict[str, Any]:
+    document: dict[str, Any] = json.loads("".join(export_config()))
+    return document
+
+
+class TransferTestCase(TestCase):
+    def setUp(self) -> None:
+        chain_1 = ChainFactory.create(id=1)
+        chain_2 = ChainFactory.create(id=2)
+        GasPriceFactory.create_batch(2, chain=chain_1)
+        WalletFactory.create(key="wallet", chains=(chain_2,))
+        FeatureFactory.create(key="feature", chains=(chain_1, chain_2))
+        provider = ProviderFactory.create(url="https://provider.safe.global")
+        client = ClientFactory.create(url="client.safe.global")
+        safe_app = SafeAppFactory.create(
+            chain_ids=[1], provider=provider, exclusive_clients=(client,)
+        )
+        TagFactory.create(name="tag", safe_apps=(safe_app,))
+
+    def test_export(self) -> None:
+        document = _export()
+
+        self.assertEqual(document["version"], 1)
+        self.assertEqual([chain["id"] for chain in document["chains"]], [1, 2])
+        self.assertEqual(len(document["chains"][0]["gas_prices"]), 2)
+        self.assertEqual(document["wallets"], [{"key": "wallet", "chains": [2]}])
+        self.assertIn({"key": "feature", "chains": [1, 2]}, document["features"])
+        self.assertEqual(
+            document["safe_apps"][0]["exclusive_clients"], ["client.safe.global"]
+        )
+        self.assertEqual(
+            document["safe_apps"][0]["provider_id"], "https://provider.safe.global"
+        )
+        self.assertEqual(
+            document["tags"],
+            [{"name": "tag", "safe_apps": [document["safe_apps"][0]["app_id"]]}],
+        )
+
+    def test_import_exported_document(self) -> None:
+        document = _export()
+
+        counts = import_config(document)
+
+        self.assertEqual(_export(), document)
+        self.assertEqual(counts["chains"], 2)
+        self.assertEqual(counts["safe_apps"], 1)
+
+    def test_import_replaces_the_configuration(self) -> None:
+        document = _export()
+        ChainFactory.create(id=3)
+        WalletFactory.create(key="other-wallet")
+        SafeAppFactory.create()
+        Chain.objects.filter(id=1).update(name="Updated")
+
+        import_config(document)
+
+        self.assertEqual(_export(), document)
+        self.assertEqual(list(Chain.objects.values_list("id", flat=True)), [1, 2])
+        self.assertEqual(Chain.objects.get(id=1).name, document["chains"][0]["name"])
+        self.assertEqual(list(Wallet.objects.values_list("key", flat=True)), ["wallet"])
+
+    def test_import_into_empty_database(self) -> None:
+        document = _export()
+        for model in (Tag, SafeApp, Client, Provider, Wallet, Feature, GasPrice, Chain):
+            model.objects.all().delete()
+
+        import_config(document)
+
+        self.assertEqual(_export(), document)
+        # The Safe App ids sequence is reset after the import
+        safe_app = SafeAppFactory.create()
+        self.assertGreater(safe_app.app_id, document["safe_apps"][0]["app_id"])
+
+    def test_import_safe_app_ids_out_of_the_sequence_bounds(self) -> None:
+        document = _export()
+        document["safe_apps"][0]["app_id"] = 0
+        document["tags"][0]["safe_apps"] = [0]
+
+        import_config(document)
+
+        self.assertEqual(_export(), document)
+        self.assertEqual(SafeAppFactory.create(app_id=None).app_id, 1)
+
+    def test_import_invalidates_once(self) -> None:
+        document = _export()
+
+        with mock.patch(
+            "config.transfer.invalidate_snapshot"
+        ) as invalidate_snapshot, mock.patch(
+            "chains.signals.invalidate_snapshot"
+        ) as signal_invalidate_snapshot, mock.patch(
+            "config.transfer.clients.safe_client_gateway.flush"
+        ) as flush:
+            with self.captureOnCommitCallbacks(execute=True):
+                import_config(document)
+
+        invalidate_snapshot.assert_called_once()
+        signal_invalidate_snapshot.assert_not_called()
+        flush.assert_called_once()
+
+    def test_invalid_document(self) -> None:
+        document = _export()
+        invalid_documents = [
+            ([], "Expected a document of version 1"),
+            ({**document, "version": 2}, "Expected a document of version 1"),
+            ({**document, "tags": None}, "tags: expected a list"),
+            (
+                {**document, "chains": [{**document["chains"][0], "l2": "maybe"}]},
+                "chains[0]: l2:",
+            ),
+            (
+                {**document, "clients": [{"url": "client.safe.global", "id": 1}]},
+                "clients[0]: unknown fields ['id']",
+            ),
+            (
+                {**document, "chains": document["chains"][:1]},
+                "wallets[0].chains: unknown references [2]",
+            ),
+            (
+                {**document, "chains": document["chains"] * 2},
+                "chains: duplicated keys",
+            ),
+            (
+                {**document, "wallets": document["wallets"] * 2},
+                "wallets: duplicated keys",
+            ),
+            (
+                {**document, "safe_apps": document["safe_apps"] * 2},
+                "safe_apps: duplicated keys",
+            ),
+        ]
+        for invalid_document, message in invalid_documents:
+            with self.subTest(message=message):
+                with self.assertRaisesMessage(ValidationError, message):
+                    import_config(invalid_document)
+
+        # Nothing was changed
+        self.assertEqual(_export(), document)
+
+
+class TransferCommandsTestCase(TestCase):
+    def test_export_and_import(self) -> None:
+        GasPriceFactory.create(chain=ChainFactory.create(id=1))
+        SafeAppFactory.create()
+
+        with tempfile.NamedTemporaryFile(suffix=".json") as document_file:
+            call_command("export_config", output=document_file.name)
+            document = json.load(document_file)
+            Chain.objects.all().delete()
+            stdout = StringIO()
+            call_command("import_config", document_file.name, stdout=stdout)
+
+        self.assertEqual(_export(), document)
+        self.assertIn("Imported 1 chains", stdout.getvalue())
+
+    def test_export_to_stdout(self) -> None:
+        ChainFactory.create(id=1)
+        stdout = StringIO()
+
+        call_command("export_config", stdout=stdout)
+
+        self.assertEqual(json.loads(stdout.getvalue()), _export())
+
+    def test_import_invalid_document(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".json") as document_file:
+            json.dump({"version": 0}, document_file)
+            document_file.flush()
+
+            with self.assertRaisesMessage(
+                CommandError, "Expected a document of version 1"
+            ):
+                call_command("import_config", document_file.name)
+
+
+class ConfigViewTestCase(APITestCase):
+    def setUp(self) -> None:
+        ChainFactory.create(id=1)
+        self.admin = User.objects.create_superuser(
+            "admin", "admin@example.com", "password"
+        )
+
+    def test_authentication_is_required(self) -> None:
+        User.objects.create_user("user", "user@example.com", "password")
+        self.client.login(username="user", password="password")
+
+        response = self.client.get(reverse("config"))
+        put_response = self.client.put(reverse("config"), _export(), format="json")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(put_response.status_code, 403)
+
+    def test_export(self) -> None:
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.get(reverse("config"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            _export(),
+        )
+
+    def test_import(self) -> None:
+        document = _export()
+        ChainFactory.create(id=2)
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.put(reverse("config"), document, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["chains"], 1)
+        self.assertEqual(_export(), document)
+
+    def test_import_invalid_document(self) -> None:
+        self.client.force_authenticate(self.admin)
+
+        response = self.client.put(reverse("config"), {"version": 0}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), ["Expected a document of version 1"])
@@ -0,0 +1,427 @@
+"""
+Export and import of the complete configuration (chains and Safe Apps, with all
+their related models) as a single JSON document, e.g. to promote the
+configuration of an environment to another one.
+
+The document has a section per model, in dependency order. Relations are
+referenced by their natural keys: chain ids, wallet/feature keys, provider and
+client urls and Safe App ids.
+
+Importing a document replaces the current configuration: rows missing from the
+document are deleted. Every model is written with a few bulk queries within a
+single transaction, and the caches (and CGW) are invalidated once on commit.
+"""
+from collections import defaultdict
+from typing import Any, Collection, Iterable, Iterator, TypeVar, Union
+
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Q, Value
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+import clients.safe_client_gateway
+from chains.models import Chain, Feature, GasPrice, Wallet
+from chains.snapshot import invalidate_snapshot
+from config.cache import suspend_invalidations
+from safe_apps.cache import invalidate_safe_apps_cache
+from safe_apps.models import Client, Provider, SafeApp, Tag
+
+FORMAT_VERSION = 1
+
+SECTIONS = [
+    "chains",
+    "wallets",
+    "features",
+    "providers",
+    "clients",
+    "safe_apps",
+    "tags",
+]
+
+_ModelT = TypeVar("_ModelT", bound=models.Model)
+
+
+def _fields(model: type[models.Model], exclude: Collection[str] = ()) -> list[str]:
+    return [
+        field.attname for field in model._meta.fields if field.attname not in exclude
+    ]
+
+
+# Fields of the rows of each section (besides their relations). The logo URLs
+# depend on the storage of each environment: they are resolved on import
+CHAIN_FIELDS = _fields(Chain, exclude=["currency_logo_url"])
+GAS_PRICE_FIELDS = _fields(GasPrice, exclude=["id", "chain_id"])
+PROVIDER_FIELDS = _fields(Provider)
+SAFE_APP_FIELDS = _fields(SafeApp)
+
+
+def _array_agg(field: str) -> ArrayAgg:
+    # The ids (or urls) of the related rows, sorted. Empty if there are none
+    return ArrayAgg(
+        field,
+        filter=Q(**{f"{field}__isnull": False}),
+        default=Value([]),
+        ordering=field,
+    )
+
+
+def _export_chains() -> Iterator[dict[str, Any]]:
+    gas_prices = defaultdict(list)
+    for gas_price in GasPrice.objects.order_by("chain_id", "rank", "id").values(
+        "chain_id", *GAS_PRICE_FIELDS
+    ):
+        gas_prices[gas_price.pop("chain_id")].append(gas_price)
+    for chain in Chain.objects.order_by("id").values(*CHAIN_FIELDS).iterator():
+        yield {**chain, "gas_prices": gas_prices[chain["id"]]}
+
+
+def _export_chain_relations(
+    model: Union[type[Wallet], type[Feature]]
+) -> Iterator[dict[str, Any]]:
+    for key, chain_ids in (
+        model.objects.order_by("key")
+        .annotate(chain_ids=_array_agg("chains"))
+        .values_list("key", "chain_ids")
+    ):
+        yield {"key": key, "chains": chain_ids}
+
+
+def _export_safe_apps() -> Iterator[dict[str, Any]]:
+    for safe_app in (
+        SafeApp.objects.order_by("app_id")
+        .annotate(client_urls=_array_agg("exclusive_clients__url"))
+        .values(*SAFE_APP_FIELDS, "client_urls")
+    ):
+        safe_app["exclusive_clients"] = safe_app.pop("client_urls")
+        yield safe_app
+
+
+def _export_tags() -> Iterator[dict[str, Any]]:
+    for name, safe_app_ids in (
+        Tag.objects.order_by("name", "id")
+        .annotate(safe_app_ids=_array_agg("safe_apps"))
+        .values_list("name", "safe_app_ids")
+    ):
+        yield {"name": name, "safe_apps": safe_app_ids}
+
+
+def export_config() -> Iterator[str]:
+    """
+    Yields the JSON document of the current configuration in chunks (one per row)
+    """
+    sections: dict[str, Iterable[Any]] = {
+        "chains": _export_chains(),
+        "wallets": _export_chain_relations(Wallet),
+        "features": _export_chain_relations(Feature),
+        "providers": Provider.objects.order_by("url").values(*PROVIDER_FIELDS),
+        "clients": Client.objects.order_by("url").values("url"),
+        "safe_apps": _export_safe_apps(),
+        "tags": _export_tags(),
+    }
+    encoder = DjangoJSONEncoder()
+    yield f'{{"version": {FORMAT_VERSION}'
+    for section, rows in sections.items():
+        yield f', "{section}": ['
+        for index, row in enumerate(rows):
+            yield (", " if index else "") + encoder.encode(row)
+        yield "]"
+    yield "}\n"
+
+
+def _build(
+    model: type[_ModelT],
+    row: Any,
+    location: str,
+    fields: Collection[str],
+    relations: Collection[str] = (),
+    exclude: Collection[str] = (),
+) -> tuple[_ModelT, dict[str, Any]]:
+    """
+    Returns the (validated) instance of the given row and its relations
+    """
+    if not isinstance(row, dict):
+        raise ValidationError(f"{location}: expected an object")
+    unknown_fields = set(row) - set(fields) - set(relations)
+    if unknown_fields:
+        raise ValidationError(f"{location}: unknown fields {sorted(unknown_fields)}")
+    instance = model(
+        **{field: value for field, value in row.items() if field in fields}
+    )
+    try:
+        # Uniqueness is enforced by the database, the relations by the import
+        instance.full_clean(exclude=exclude, validate_unique=False)
+    except ValidationError as error:
+        messages = "; ".join(
+            f"{field}: {' '.join(field_messages)}"
+            for field, field_messages in error.message_dict.items()
+        )
+        raise ValidationError(f"{location}: {messages}")
+    return instance, {relation: row.get(relation, []) for relation in relations}
+
+
+def _check_references(location: str, references: Any, known: Collection[Any]) -> None:
+    if not isinstance(references, list):
+        raise ValidationError(f"{location}: expected a list")
+    unknown = [reference for reference in references if reference not in known]
+    if unknown:
+        raise ValidationError(f"{location}: unknown references {unknown}")
+
+
+def _check_unique(section: str, keys: list[Any]) -> None:
+    if len(set(keys)) != len(keys):
+        raise ValidationError(f"{section}: duplicated keys")
+
+
+def _replace(
+    model: type[_ModelT],
+    instances: list[_ModelT],
+    unique_field: str,
+    update_fields: Collection[str] = (),
+) -> None:
+    """
+    Deletes the rows missing from instances, then inserts (or updates) the others
+    """
+    keys = [getattr(instance, unique_field) for instance in instances]
+    model._default_manager.exclude(**{f"{unique_field}__in": keys}).delete()
+    if update_fields:
+        model._default_manager.bulk_create(
+            instances,
+            update_conflicts=True,
+            unique_fields=[unique_field],
+            update_fields=update_fields,
+        )
+    else:
+        model._default_manager.bulk_create(instances, ignore_conflicts=True)
+
+
+def _import_chains(rows: list[Any]) -> set[int]:
+    chains: list[Chain] = []
+    gas_prices: list[GasPrice] = []
+    for index, row in enumerate(rows):
+        # Only the name of the currency logo is part of the document
+        chain, relations = _build(
+            Chain,
+            row,
+            f"chains[{index}]",
+            CHAIN_FIELDS,
+            relations=["gas_prices"],
+            exclude=["currency_logo_uri"],
+        )
+        chain.currency_logo_url = chain.get_currency_logo_url() or ""
+        chains.append(chain)
+        for gas_price_index, gas_price_row in enumerate(relations["gas_prices"]):
+            gas_price, _ = _build(
+                GasPrice,
+                gas_price_row,
+                f"chains[{index}].gas_prices[{gas_price_index}]",
+                GAS_PRICE_FIELDS,
+                exclude=["chain"],
+            )
+            gas_price.chain_id = chain.id
+            gas_prices.append(gas_price)
+    _check_unique("chains", [chain.id for chain in chains])
+
+    _replace(Chain, chains, "id", update_fields=_fields(Chain, exclude=["id"]))
+    # Gas prices have no natural key: they are all replaced
+    GasPrice.objects.all().delete()
+    GasPrice.objects.bulk_create(gas_prices)
+    return {chain.id for chain in chains}
+
+
+def _import_chain_relations(
+    model: Union[type[Wallet], type[Feature]],
+    through: type[models.Model],
+    section: str,
+    rows: list[Any],
+    chain_ids: set[int],
+) -> None:
+    instances = []
+    enabled_chains: list[tuple[str, list[int]]] = []
+    for index, row in enumerate(rows):
+        location = f"{section}[{index}]"
+        instance, relations = _build(
+            model, row, location, ["key"], relations=["chains"]
+        )
+        _check_references(f"{location}.chains", relations["chains"], chain_ids)
+        instances.append(instance)
+        enabled_chains.append((row["key"], relations["chains"]))
+    _check_unique(section, [key for key, _ in enabled_chains])
+
+    _replace(model, instances, "key")
+    ids = dict(model.objects.values_list("key", "id"))
+    through._default_manager.all().delete()
+    through._default_manager.bulk_create(
+        through(**{f"{model._meta.model_name}_id": ids[key], "chain_id": chain_id})
+        for key, enabled_chain_ids in enabled_chains
+        for chain_id in enabled_chain_ids
+    )
+
+
+def _import_safe_apps(
+    provider_rows: list[Any],
+    client_rows: list[Any],
+    safe_app_rows: list[Any],
+    tag_rows: list[Any],
+) -> None:
+    providers = [
+        _build(Provider, row, f"providers[{index}]", PROVIDER_FIELDS)[0]
+        for index, row in enumerate(provider_rows)
+    ]
+    provider_urls = {provider.url for provider in providers}
+    _check_unique("providers", [provider.url for provider in providers])
+    clients = [
+        _build(Client, row, f"clients[{index}]", ["url"])[0]
+        for index, row in enumerate(client_rows)
+    ]
+    _check_unique("clients", [client.url for client in clients])
+    client_urls = {client.url for client in clients}
+
+    safe_apps = []
+    exclusive_clients: dict[int, list[str]] = {}
+    for index, row in enumerate(safe_app_rows):
+        location = f"safe_apps[{index}]"
+        safe_app, relations = _build(
+            SafeApp,
+            row,
+            location,
+            SAFE_APP_FIELDS,
+            relations=["exclusive_clients"],
+            exclude=["provider"],
+        )
+        if safe_app.app_id is None:
+            raise ValidationError(f"{location}: app_id is required")
+        if safe_app.provider_id is not None:
+            _check_references(
+                f"{location}.provider_id", [safe_app.provider_id], provider_urls
+            )
+        _check_references(
+            f"{location}.exclusive_clients", relations["exclusive_clients"], client_urls
+        )
+        safe_apps.append(safe_app)
+        exclusive_clients[safe_app.app_id] = relations["exclusive_clients"]
+    _check_unique("safe_apps", [safe_app.app_id for safe_app in safe_apps])
+    safe_app_ids = {safe_app.app_id for safe_app in safe_apps}
+
+    tags = []
+    for index, row in enumerate(tag_rows):
+        location = f"tags[{index}]"
+        tag, relations = _build(Tag, row, location, ["name"], relations=["safe_apps"])
+        _check_references(f"{location}.safe_apps", relations["safe_apps"], safe_app_ids)
+        tags.append((tag, relations["safe_apps"]))
+
+    _replace(Provider, providers, "url", update_fields=["name"])
+    _replace(Client, clients, "url")
+    _replace(
+        SafeApp, safe_apps, "app_id", update_fields=_fields(SafeApp, exclude=["app_id"])
+    )
+    # The Safe App ids were set explicitly, so the next generated one is reset.
+    # Unlike with sequence_reset_sql, ids lower than 1 (out of the bounds of the
+    # sequence) are allowed
+    max_app_id = max(safe_app_ids, default=0)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'app_id'), %s, %s)",
+            [SafeApp._meta.db_table, max(max_app_id, 1), max_app_id >= 1],
+        )
+
+    client_ids = dict(Client.objects.values_list("url", "id"))
+    SafeApp.exclusive_clients.through.objects.all().delete()
+    SafeApp.exclusive_clients.through.objects.bulk_create(
+        SafeApp.exclusive_clients.through(
+            safeapp_id=safe_app_id, client_id=client_ids[client_url]
+        )
+        for safe_app_id, client_urls in exclusive_clients.items()
+        for client_url in client_urls
+    )
+
+    # Tags have no natural key: they are all replaced
+    Tag.objects.all().delete()
+    Tag.objects.bulk_create(tag for tag, _ in tags)
+    Tag.safe_apps.through.objects.bulk_create(
+        Tag.safe_apps.through(tag_id=tag.id, safeapp_id=safe_app_id)
+        for tag, safe_app_ids in tags
+        for safe_app_id in safe_app_ids
+    )
+
+
+def _flush_cgw() -> None:
+    clients.safe_client_gateway.flush(
+        cgw_url=settings.CGW_URL,
+        cgw_flush_token=settings.CGW_FLUSH_TOKEN,
+        json={"invalidate": "Chains"},
+    )
+
+
+def import_config(document: Any) -> dict[str, int]:
+    """
+    Replaces the current configuration with the given document (see
+    export_config). Returns the number of rows of each section.
+
+    Raises ValidationError if the document is not valid, in which case
+    nothing is changed.
+    """
+    if not isinstance(document, dict) or document.get("version") != FORMAT_VERSION:
+        raise ValidationError(f"Expected a document of version {FORMAT_VERSION}")
+    for section in SECTIONS:
+        if not isinstance(document.get(section), list):
+            raise ValidationError(f"{section}: expected a list")
+
+    try:
+        with transaction.atomic():
+            with suspend_invalidations():
+                chain_ids = _import_chains(document["chains"])
+                _import_chain_relations(
+                    Wallet,
+                    Wallet.chains.through,
+                    "wallets",
+                    document["wallets"],
+                    chain_ids,
+                )
+                _import_chain_relations(
+                    Feature,
+                    Feature.chains.through,
+                    "features",
+                    document["features"],
+                    chain_ids,
+                )
+                _import_safe_apps(
+                    document["providers"],
+                    document["clients"],
+                    document["safe_apps"],
+                    document["tags"],
+                )
+            invalidate_snapshot()
+            invalidate_safe_apps_cache()
+            transaction.on_commit(_flush_cgw)
+    except IntegrityError as error:
+        raise ValidationError(str(error))
+    return {section: len(document[section]) for section in SECTIONS}
+
+
+class ConfigView(APIView):
+    """
+    GET exports the configuration, PUT replaces it (see config.transfer)
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    # The document is not camelized
+    parser_classes = [JSONParser]
+    swagger_schema = None
+
+    def get(self, request: Request) -> StreamingHttpResponse:
+        return StreamingHttpResponse(export_config(), content_type="application/json")
+
+    def put(self, request: Request) -> Response:
+        try:
+            counts = import_config(request.data)
+        except ValidationError as error:
+            raise serializers.ValidationError(error.messages)
+        return Response(counts)
@@ -2,6 +2,10 @@ import shutil
 import tempfile
 
 import pytest
+from django.core.cache import caches
+
+from config import schema
+from safe_apps import cache as safe_apps_cache
 
 
 @pytest.fixture(autouse=True)
@@ -18,3 +22,14 @@ def use_tmp_media_root(settings):
 
     # After running each test remove the tmp directory
     shutil.rmtree(settings.MEDIA_ROOT)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Cached responses/snapshots should not leak between tests
+    # (the database is rolled back after each test but the caches are not)
+    for cache in caches.all():
+        cache.clear()
+    schema._local_artifacts.clear()
+    safe_apps_cache._requests.clear()
+    safe_apps_cache._cached_requests.clear()
@@ -0,0 +1,175 @@
+import hashlib
+import io
+import logging
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Callable, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import HttpRequest
+from django.template.response import SimpleTemplateResponse
+
+from config.cache import (
+    ConfigVersion,
+    on_commit_once,
+    revalidate_in_background,
+    revalidating,
+)
+
+logger = logging.getLogger(__name__)
+
+# Changes every time the Safe Apps (or any of their related models) change. The
+# cached Safe Apps responses are keyed by it (see SafeAppsListView)
+safe_apps_version = ConfigVersion("safe-apps:version")
+
+# Distinct requests counted before only the most requested ones are kept
+_MAX_COUNTED_REQUESTS = 1_000
+
+
+class CachedRequest(NamedTuple):
+    """
+    What the cache key of a Safe Apps response depends on
+    """
+
+    scheme: str
+    host: str
+    path_info: str
+    query_string: str
+    accept: Optional[str]
+
+
+# Safe Apps requests served by this process, by cache key (the requests with the
+# same key share their cached response). As every worker gets a share of the
+# traffic, they are a sample of the most requested filter combinations
+_requests: Counter[str] = Counter()
+# One of the requests counted for each cache key, replayed to warm it up
+_cached_requests: dict[str, CachedRequest] = {}
+_requests_lock = threading.Lock()
+
+# Set while this process replays the counted requests (see _render)
+_replaying: ContextVar[bool] = ContextVar("replaying", default=False)
+
+
+def _to_cached_request(request: HttpRequest) -> CachedRequest:
+    return CachedRequest(
+        scheme=request.scheme or "http",
+        host=request.get_host(),
+        path_info=request.path_info,
+        query_string=request.META.get("QUERY_STRING", ""),
+        accept=request.META.get("HTTP_ACCEPT"),
+    )
+
+
+def count_request(request: HttpRequest, cache_key: str) -> None:
+    if _replaying.get():  # Warming up or revalidating, not served
+        return
+    with _requests_lock:
+        _requests[cache_key] += 1
+        if cache_key not in _cached_requests:
+            _cached_requests[cache_key] = _to_cached_request(request)
+        if len(_requests) > _MAX_COUNTED_REQUESTS:
+            most_common = dict(_requests.most_common(_MAX_COUNTED_REQUESTS // 10))
+            _requests.clear()
+            _requests.update(most_common)
+            for key in list(_cached_requests):
+                if key not in most_common:
+                    del _cached_requests[key]
+
+
+def _to_http_request(cached_request: CachedRequest) -> HttpRequest:
+    environ: dict[str, Any] = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": cached_request.path_info,
+        "QUERY_STRING": cached_request.query_string,
+        "HTTP_HOST": cached_request.host,
+        "SERVER_NAME": cached_request.host,
+        "SERVER_PORT": "443" if cached_request.scheme == "https" else "80",
+        "wsgi.url_scheme": cached_request.scheme,
+        "wsgi.input": io.BytesIO(),
+    }
+    if cached_request.accept is not None:
+        environ["HTTP_ACCEPT"] = cached_request.accept
+    return WSGIRequest(environ)
+
+
+def _render(cached_request: CachedRequest) -> None:
+    from .views import SafeAppsListView
+
+    view: Callable[..., SimpleTemplateResponse] = SafeAppsListView.as_view()
+    token = _replaying.set(True)
+    try:
+        view(_to_http_request(cached_request)).render()
+    finally:
+        _replaying.reset(token)
+
+
+def warm_safe_apps_cache() -> int:
+    """
+    Renders (and so caches for the current version) the responses of the
+    Safe Apps requests most served by this process. Returns their number
+    """
+    with _requests_lock:
+        most_common = [
+            _cached_requests[cache_key]
+            for cache_key, _ in _requests.most_common(
+                settings.SAFE_APPS_CACHE_WARM_SIZE
+            )
+        ]
+    for cached_request in most_common:
+        _render(cached_request)
+    return len(most_common)
+
+
+def revalidate_safe_apps_response(request: HttpRequest) -> None:
+    """
+    Renders (and caches) the stale cached response of request again, in the
+    background
+    """
+    cached_request = _to_cached_request(request)
+
+    def revalidate() -> None:
+        with revalidating():
+            _render(cached_request)
+
+    key = hashlib.md5(repr(cached_request).encode(), usedforsecurity=False)
+    revalidate_in_background("safe-apps", key.hexdigest(), revalidate)
+
+
+def _warm_in_background() -> None:
+    def warm() -> None:
+        try:
+            logger.info("Warming safe-apps cache. version=%d", safe_apps_version.get())
+            warm_safe_apps_cache()
+        except Exception:
+            logger.exception("Could not warm the safe-apps cache")
+        finally:
+            # Connections are per thread
+            connections.close_all()
+
+    if _requests and settings.SAFE_APPS_CACHE_WARM_SIZE:
+        threading.Thread(
+            target=warm, name="safe-apps-cache-warmer", daemon=True
+        ).start()
+
+
+def _invalidate() -> None:
+    safe_apps_version.bump()
+
+
+def _invalidate_committed() -> None:
+    _invalidate()
+    _warm_in_background()
+
+
+def invalidate_safe_apps_cache() -> None:
+    """
+    Invalidates the cached Safe Apps responses right away and once again after
+    the current transaction (if any) is committed: a response rendered by another
+    worker in the meantime still contains the previously committed data. The
+    most requested responses are then rendered again in the background
+    """
+    _invalidate()
+    on_commit_once(_invalidate_committed)
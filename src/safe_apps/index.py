@@ -0,0 +1,181 @@
+import logging
+from typing import Any, Mapping, NamedTuple, Optional
+
+from config.cache import SingleFlight
+from config.metrics import observe_cache_lookup, track_serialization
+
+from .cache import safe_apps_version
+from .models import SafeApp
+from .serializers import SafeAppsResponseSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class SafeAppsIndex(NamedTuple):
+    version: int
+    # SafeAppsResponseSerializer payload of every visible Safe App
+    apps: list[dict[str, Any]]
+    # Positions (in apps) of the Safe Apps
+    by_chain_id: dict[int, frozenset[int]]
+    by_client_url: dict[str, frozenset[int]]
+    by_url: dict[str, frozenset[int]]
+    without_restrictions: frozenset[int]
+
+
+class SafeAppsFilters(NamedTuple):
+    chain_id: Optional[int]
+    client_url: Optional[str]
+    url: Optional[str]
+
+
+# Stands for the filter values no Safe App matches (NUL is never a filter value)
+_UNMATCHED = "\0"
+
+
+# Index of the current version for this process
+_local_index: Optional[SafeAppsIndex] = None
+
+# The index is built by one thread, the others of this process wait for it
+_index_builds = SingleFlight("safe-apps-index")
+
+
+def _freeze(index: dict[Any, set[int]]) -> dict[Any, frozenset[int]]:
+    return {key: frozenset(positions) for key, positions in index.items()}
+
+
+def build_index(version: int) -> SafeAppsIndex:
+    logger.info("Building Safe Apps index. version=%d", version)
+    queryset = SafeAppsResponseSerializer.setup_eager_loading(
+        SafeApp.objects.filter(visible=True).order_by("app_id")
+    )
+
+    apps = []
+    by_chain_id: dict[int, set[int]] = {}
+    by_client_url: dict[str, set[int]] = {}
+    by_url: dict[str, set[int]] = {}
+    without_restrictions = set()
+    for position, safe_app in enumerate(queryset):
+        with track_serialization():
+            apps.append(dict(SafeAppsResponseSerializer(safe_app).data))
+        for chain_id in safe_app.chain_ids:
+            by_chain_id.setdefault(chain_id, set()).add(position)
+        by_url.setdefault(safe_app.url, set()).add(position)
+        clients = safe_app.exclusive_clients.all()
+        for client in clients:
+            by_client_url.setdefault(client.url, set()).add(position)
+        if not clients:
+            without_restrictions.add(position)
+
+    return SafeAppsIndex(
+        version=version,
+        apps=apps,
+        by_chain_id=_freeze(by_chain_id),
+        by_client_url=_freeze(by_client_url),
+        by_url=_freeze(by_url),
+        without_restrictions=frozenset(without_restrictions),
+    )
+
+
+def _store_index(index: SafeAppsIndex) -> SafeAppsIndex:
+    global _local_index
+    _local_index = index
+    return index
+
+
+def _current_index(version: int) -> Optional[SafeAppsIndex]:
+    index = _local_index
+    return index if index is not None and index.version == version else None
+
+
+def get_index(version: Optional[int] = None) -> SafeAppsIndex:
+    """
+    Returns the index of version (by default the current one, see
+    config.cache.request_version)
+    """
+    # Read before building: changes made meanwhile bump it and trigger a rebuild
+    current = safe_apps_version.get() if version is None else version
+    index = _current_index(current)
+    observe_cache_lookup("safe-apps-index", hit=index is not None)
+    if index is None:
+        index = _index_builds.run(
+            str(current),
+            compute=lambda: _store_index(build_index(current)),
+            fetch=lambda: _current_index(current),
+        )
+    return index
+
+
+def find_safe_apps(
+    chain_id: Optional[int] = None,
+    client_url: Optional[str] = None,
+    url: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Returns the visible Safe Apps available on chain_id, for client_url and
+    served from url (filters set to None are not applied)
+    """
+    index = get_index()
+    positions: Optional[frozenset[int]] = None
+
+    def intersect(matches: frozenset[int]) -> None:
+        nonlocal positions
+        positions = matches if positions is None else positions & matches
+
+    if chain_id is not None:
+        intersect(index.by_chain_id.get(chain_id, frozenset()))
+    if client_url is not None:
+        intersect(
+            index.without_restrictions
+            | index.by_client_url.get(client_url, frozenset())
+        )
+    if url is not None:
+        intersect(index.by_url.get(url, frozenset()))
+
+    if positions is None:
+        return list(index.apps)
+    return [index.apps[position] for position in sorted(positions)]
+
+
+def get_filters(query_params: Mapping[str, str]) -> SafeAppsFilters:
+    """
+    Returns the filters of the query parameters, without the invalid ones (which
+    are not applied)
+    """
+    chain_id = query_params.get("chainId")
+    # isdecimal (unlike isdigit) rejects the digits int() cannot parse (e.g. "²")
+    if chain_id is not None and not chain_id.isdecimal():
+        chain_id = None
+
+    client_url = query_params.get("clientUrl")
+    if not client_url or "\0" in client_url:
+        client_url = None
+
+    url = query_params.get("url")
+    if not url or "\0" in url:
+        url = None
+
+    return SafeAppsFilters(
+        chain_id=int(chain_id) if chain_id is not None else None,
+        client_url=client_url,
+        url=url,
+    )
+
+
+def filters_key(filters: SafeAppsFilters, index: Optional[SafeAppsIndex] = None) -> str:
+    """
+    Returns the same key for the filters that find the same Safe Apps: the values
+    no Safe App matches all have the same effect, so there are at most as many
+    keys as combinations of the values of the index (by default the current one)
+    """
+    if index is None:
+        index = get_index()
+    chain_id: Optional[object] = filters.chain_id
+    if chain_id is not None and chain_id not in index.by_chain_id:
+        chain_id = _UNMATCHED
+    client_url = filters.client_url
+    if client_url is not None and client_url not in index.by_client_url:
+        client_url = _UNMATCHED
+    url = filters.url
+    if url is not None and url not in index.by_url:
+        url = _UNMATCHED
+    return repr((chain_id, client_url, url))
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.3 on 2026-10-17 06:24
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("safe_apps", "0008_tag"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="safeapp",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("visible", True)),
+                fields=["chain_ids"],
+                name="safeapp_visible_chain_ids_gin",
+            ),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from enum import Enum
 
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import RegexValidator
 from django.db import models
 
@@ -55,8 +56,19 @@ class SafeApp(models.Model):
         help_text="Clients that are only allowed to use this SafeApp",
     )
 
+    class Meta:
+        indexes = [
+            # Used by the chain_ids__contains lookups of the visible Safe Apps
+            GinIndex(
+                fields=["chain_ids"],
+                condition=models.Q(visible=True),
+                name="safeapp_visible_chain_ids_gin",
+            ),
+        ]
+
     def get_access_control_type(self) -> AccessControlPolicy:
-        if self.exclusive_clients.exists():
+        # all() returns the prefetched clients (if any), so no query is made for them
+        if self.exclusive_clients.all().exists():
             return SafeApp.AccessControlPolicy.DOMAIN_ALLOWLIST
         return SafeApp.AccessControlPolicy.NO_RESTRICTIONS
 
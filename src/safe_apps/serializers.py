@@ -1,3 +1,4 @@
+from django.db.models import Prefetch, QuerySet
 from drf_yasg.utils import swagger_serializer_method
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
@@ -55,6 +56,17 @@ class SafeAppsResponseSerializer(serializers.ModelSerializer[SafeApp]):
             "tags",
         ]
 
+    @staticmethod
+    def setup_eager_loading(queryset: QuerySet[SafeApp]) -> QuerySet[SafeApp]:
+        """
+        Loads (already sorted) the relations rendered by this serializer
+        so that the number of queries does not depend on the number of apps
+        """
+        return queryset.select_related("provider").prefetch_related(
+            Prefetch("exclusive_clients", queryset=Client.objects.order_by("id")),
+            Prefetch("tag_set", queryset=Tag.objects.order_by("name")),
+        )
+
     @swagger_serializer_method(serializer_or_field=DomainAllowlistAccessControlPolicySerializer)  # type: ignore[misc]
     def get_access_control(self, instance: SafeApp) -> ReturnDict:
         if (
@@ -66,5 +78,5 @@ class SafeAppsResponseSerializer(serializers.ModelSerializer[SafeApp]):
 
     @swagger_serializer_method(serializer_or_field=TagSerializer)  # type: ignore[misc]
     def get_tags(self, instance) -> ReturnDict:  # type: ignore[no-untyped-def]
-        queryset = instance.tag_set.all().order_by("name")
-        return TagSerializer(queryset, many=True).data
+        # Sorted by name by setup_eager_loading
+        return TagSerializer(instance.tag_set.all(), many=True).data
@@ -2,23 +2,28 @@ import logging
 from typing import Any
 
 from django.conf import settings
-from django.core.cache import caches
-from django.db.models.signals import post_delete, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 import clients.safe_client_gateway
+from config.cache import invalidations_suspended
 
-from .models import Provider, SafeApp, Tag
+from .cache import invalidate_safe_apps_cache
+from .models import Client, Provider, SafeApp, Tag
 
 logger = logging.getLogger(__name__)
 
 
 def _flush_cgw_safe_apps() -> None:
-    clients.safe_client_gateway.flush(
-        cgw_url=settings.CGW_URL,
-        cgw_flush_token=settings.CGW_FLUSH_TOKEN,
-        # Even though the payload is Chains, it actually invalidates all the safe-config related cache
-        json={"invalidate": "Chains"},
+    # Queued once the changes are committed and coalesced with the other flushes
+    transaction.on_commit(
+        lambda: clients.safe_client_gateway.flush(
+            cgw_url=settings.CGW_URL,
+            cgw_flush_token=settings.CGW_FLUSH_TOKEN,
+            # Even though the payload is Chains, it actually invalidates all the safe-config related cache
+            json={"invalidate": "Chains"},
+        )
     )
 
 
@@ -28,7 +33,26 @@ def _flush_cgw_safe_apps() -> None:
 @receiver(post_delete, sender=Provider)
 @receiver(post_save, sender=Tag)
 @receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
 def on_safe_app_update(sender: SafeApp, **kwargs: Any) -> None:
-    logger.info("Clearing safe-apps cache")
-    caches["safe-apps"].clear()
+    if invalidations_suspended():
+        return
+    logger.info("Invalidating safe-apps cache")
+    invalidate_safe_apps_cache()
     _flush_cgw_safe_apps()
+
+
+# Changes to the exclusive clients or to the tags of a Safe App (e.g. with the
+# inlines of the SafeApp admin) only change the M2M through tables
+@receiver(m2m_changed, sender=SafeApp.exclusive_clients.through)
+@receiver(post_save, sender=SafeApp.exclusive_clients.through)
+@receiver(post_delete, sender=SafeApp.exclusive_clients.through)
+@receiver(m2m_changed, sender=Tag.safe_apps.through)
+@receiver(post_save, sender=Tag.safe_apps.through)
+@receiver(post_delete, sender=Tag.safe_apps.through)
+def on_safe_app_relation_update(sender: Any, **kwargs: Any) -> None:
+    if invalidations_suspended():
+        return
+    logger.info("Safe App relation update. Invalidating safe-apps cache")
+    invalidate_safe_apps_cache()
@@ -0,0 +1,104 @@
+from django.test import TestCase
+
+from ..index import SafeAppsFilters, filters_key, find_safe_apps, get_filters, get_index
+from .factories import ClientFactory, SafeAppFactory
+
+
+class SafeAppsIndexTestCase(TestCase):
+    def test_index_is_built_once_per_version(self) -> None:
+        SafeAppFactory.create_batch(3)
+        index = get_index()
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_index(), index)
+            self.assertEqual(
+                len(find_safe_apps(chain_id=1, url="https://safe.global")), 0
+            )
+
+    def test_update_rebuilds_index(self) -> None:
+        safe_app = SafeAppFactory.create(name="aaa")
+        version = get_index().version
+
+        safe_app.name = "bbb"
+        safe_app.save()
+
+        index = get_index()
+        self.assertGreater(index.version, version)
+        self.assertEqual([app["name"] for app in index.apps], ["bbb"])
+
+    def test_hidden_safe_apps_are_not_indexed(self) -> None:
+        SafeAppFactory.create(visible=False)
+
+        self.assertEqual(get_index().apps, [])
+
+    def test_filters_combination(self) -> None:
+        client_1 = ClientFactory.create(url="safe.global")
+        client_2 = ClientFactory.create(url="pump.com")
+        safe_app_1 = SafeAppFactory.create(chain_ids=[1, 5], url="https://app.com")
+        safe_app_2 = SafeAppFactory.create(
+            chain_ids=[1], url="https://app.com", exclusive_clients=(client_1,)
+        )
+        safe_app_3 = SafeAppFactory.create(
+            chain_ids=[5], url="https://other.com", exclusive_clients=(client_2,)
+        )
+
+        def find_ids(**filters) -> list[int]:  # type: ignore[no-untyped-def]
+            return [app["id"] for app in find_safe_apps(**filters)]
+
+        self.assertEqual(
+            find_ids(), [safe_app_1.app_id, safe_app_2.app_id, safe_app_3.app_id]
+        )
+        self.assertEqual(find_ids(chain_id=1), [safe_app_1.app_id, safe_app_2.app_id])
+        self.assertEqual(
+            find_ids(client_url="safe.global"), [safe_app_1.app_id, safe_app_2.app_id]
+        )
+        self.assertEqual(
+            find_ids(chain_id=5, client_url="pump.com"),
+            [safe_app_1.app_id, safe_app_3.app_id],
+        )
+        self.assertEqual(
+            find_ids(chain_id=5, client_url="safe.global", url="https://app.com"),
+            [safe_app_1.app_id],
+        )
+        self.assertEqual(find_ids(chain_id=2), [])
+        self.assertEqual(find_ids(url="https://unknown.com"), [])
+
+    def test_get_filters(self) -> None:
+        cases: list[tuple[dict[str, str], SafeAppsFilters]] = [
+            ({}, SafeAppsFilters(None, None, None)),
+            (
+                {"chainId": "01", "clientUrl": "safe.global", "url": "https://app.com"},
+                SafeAppsFilters(1, "safe.global", "https://app.com"),
+            ),
+            (
+                {"chainId": "²", "clientUrl": "", "url": "https://app.com\0"},
+                SafeAppsFilters(None, None, None),
+            ),
+            ({"chainId": "-1", "unknown": "1"}, SafeAppsFilters(None, None, None)),
+        ]
+        for query_params, filters in cases:
+            with self.subTest(query_params=query_params):
+                self.assertEqual(get_filters(query_params), filters)
+
+    def test_filters_key(self) -> None:
+        client = ClientFactory.create(url="safe.global")
+        SafeAppFactory.create(
+            chain_ids=[1], url="https://app.com", exclusive_clients=(client,)
+        )
+        key = filters_key(SafeAppsFilters(1, "safe.global", "https://app.com"))
+
+        # Matching different Safe Apps
+        for filters in (
+            SafeAppsFilters(None, "safe.global", "https://app.com"),
+            SafeAppsFilters(2, "safe.global", "https://app.com"),
+            SafeAppsFilters(1, "pump.com", "https://app.com"),
+            SafeAppsFilters(1, "safe.global", None),
+        ):
+            with self.subTest(filters=filters):
+                self.assertNotEqual(filters_key(filters), key)
+
+        # Values no Safe App matches are equivalent
+        self.assertEqual(
+            filters_key(SafeAppsFilters(2, "pump.com", "https://other.com")),
+            filters_key(SafeAppsFilters(3, "other.com", "https://another.com")),
+        )
@@ -1,6 +1,12 @@
+import os
+import shutil
+import tempfile
+
 import responses
 from django.test import TestCase, override_settings
+from django.urls import reverse
 
+from clients.safe_client_gateway import flush_dispatcher
 from safe_apps.models import SafeApp, Tag
 from safe_apps.tests.factories import ProviderFactory
 
@@ -24,7 +30,9 @@ class SafeAppHookTestCase(TestCase):
             ],
         )
 
-        SafeApp(app_id=1, chain_ids=[1]).save()
+        with self.captureOnCommitCallbacks(execute=True):
+            SafeApp(app_id=1, chain_ids=[1]).save()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -50,9 +58,13 @@ class SafeAppHookTestCase(TestCase):
         )
 
         safe_app = SafeApp(app_id=1, chain_ids=[1])
-        safe_app.save()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            safe_app.save()  # create
+        flush_dispatcher.drain()
         safe_app.name = "Test app"
-        safe_app.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            safe_app.save()  # update
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -78,8 +90,12 @@ class SafeAppHookTestCase(TestCase):
         )
 
         safe_app = SafeApp(app_id=1, chain_ids=[1])
-        safe_app.save()  # create
-        safe_app.delete()  # delete
+        with self.captureOnCommitCallbacks(execute=True):
+            safe_app.save()  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            safe_app.delete()  # delete
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -110,7 +126,9 @@ class ProviderHookTestCase(TestCase):
             ],
         )
 
-        ProviderFactory.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            ProviderFactory.create()
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -135,9 +153,13 @@ class ProviderHookTestCase(TestCase):
             ],
         )
 
-        provider = ProviderFactory.create()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            provider = ProviderFactory.create()  # create
+        flush_dispatcher.drain()
         provider.name = "Test Provider"
-        provider.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            provider.save()  # update
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -162,8 +184,12 @@ class ProviderHookTestCase(TestCase):
             ],
         )
 
-        provider = ProviderFactory.create()  # create
-        provider.delete()  # delete
+        with self.captureOnCommitCallbacks(execute=True):
+            provider = ProviderFactory.create()  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            provider.delete()  # delete
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -194,7 +220,9 @@ class TagHookTestCase(TestCase):
             ],
         )
 
-        Tag().save()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag().save()  # create
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 1
         assert isinstance(responses.calls[0], responses.Call)
@@ -220,9 +248,13 @@ class TagHookTestCase(TestCase):
         )
 
         tag = Tag()
-        tag.save()  # create
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.save()  # create
+        flush_dispatcher.drain()
         tag.name = "Test Tag"
-        tag.save()  # update
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.save()  # update
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -248,8 +280,12 @@ class TagHookTestCase(TestCase):
         )
 
         tag = Tag()
-        tag.save()  # create
-        tag.delete()  # delete
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.save()  # create
+        flush_dispatcher.drain()
+        with self.captureOnCommitCallbacks(execute=True):
+            tag.delete()  # delete
+        flush_dispatcher.drain()
 
         assert len(responses.calls) == 2
         assert isinstance(responses.calls[1], responses.Call)
@@ -259,3 +295,35 @@ class TagHookTestCase(TestCase):
             responses.calls[1].request.headers.get("Authorization")
             == "Basic example-token"
         )
+
+
+class SafeAppsSharedCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+
+    def test_invalidation_does_not_clear_the_cache(self) -> None:
+        # File based caches, shared by the workers
+        caches = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": f"{self.location}/default",
+            },
+            "safe-apps": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": f"{self.location}/safe-apps",
+            },
+        }
+        url = reverse("v1:safe-apps:list")
+
+        with self.settings(CACHES=caches):
+            self.client.get(url)
+            cached_keys = len(os.listdir(f"{self.location}/safe-apps"))
+            SafeApp(app_id=1, chain_ids=[1]).save()
+            response = self.client.get(url)
+
+        # The cache is not cleared: the responses of the previous version are
+        # not read anymore and just expire
+        self.assertGreater(cached_keys, 0)
+        self.assertGreater(len(os.listdir(f"{self.location}/safe-apps")), cached_keys)
+        self.assertEqual([app["id"] for app in response.json()], [1])
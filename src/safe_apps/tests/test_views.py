@@ -1,8 +1,20 @@
+import gzip
+import json
+import time
 from typing import Any, Dict, List
+from unittest import mock
 
+import brotli
+from django.db import connection
 from django.urls import reverse
+from prometheus_client import REGISTRY
 from rest_framework.test import APITestCase
 
+from config.cache import revalidating
+
+from ..cache import _cached_requests, _requests, safe_apps_version, warm_safe_apps_cache
+from ..index import filters_key
+from ..models import SafeApp
 from .factories import ClientFactory, ProviderFactory, SafeAppFactory, TagFactory
 
 
@@ -490,10 +502,85 @@ class CacheSafeAppTests(APITestCase):
         cache_control = response.headers.get("Cache-Control")
 
         self.assertEqual(response.status_code, 200)
-        # Cache-Control should be 10 minutes (60 * 10)
-        self.assertEqual(cache_control, "max-age=600")
+        # Fresh for 10 minutes (60 * 10), then served for 1 hour while revalidated
+        self.assertEqual(cache_control, "max-age=600, stale-while-revalidate=3600")
         self.assertCountEqual(response.json(), json_response)
 
+    def test_compressed_responses(self) -> None:
+        SafeAppFactory.create_batch(5)
+        url = reverse("v1:safe-apps:list")
+        response = self.client.get(url)
+
+        for accept_encoding, decompress in (
+            ("gzip", gzip.decompress),
+            ("gzip, deflate, br", brotli.decompress),
+        ):
+            with self.subTest(accept_encoding=accept_encoding):
+                with mock.patch("safe_apps.views.find_safe_apps") as find_safe_apps:
+                    compressed_response = self.client.get(
+                        url, HTTP_ACCEPT_ENCODING=accept_encoding
+                    )
+
+                # Compressed when cached
+                find_safe_apps.assert_not_called()
+                self.assertIn("Accept-Encoding", compressed_response["Vary"])
+                self.assertEqual(
+                    decompress(compressed_response.content), response.content
+                )
+                self.assertEqual(
+                    compressed_response["Content-Length"],
+                    str(len(compressed_response.content)),
+                )
+
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_response_compressed_when_rendered(self) -> None:
+        SafeAppFactory.create_batch(5)
+        url = reverse("v1:safe-apps:list")
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 5)
+
+    def test_stale_response_is_served_while_revalidated(self) -> None:
+        SafeAppFactory.create()
+        url = reverse("v1:safe-apps:list")
+        self.client.get(url)
+
+        with mock.patch(
+            "config.cache.time.time", return_value=time.time() + 60 * 10
+        ), mock.patch("config.cache.threading.Thread") as thread, mock.patch(
+            "safe_apps.views.find_safe_apps"
+        ) as find_safe_apps:
+            response = self.client.get(url)
+            # Already being revalidated
+            self.client.get(url)
+
+        find_safe_apps.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(int(response["Age"]), 60 * 10)
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    def test_revalidation_renders_the_response_again(self) -> None:
+        SafeAppFactory.create()
+        url = reverse("v1:safe-apps:list")
+        self.client.get(url)
+
+        with mock.patch(
+            "safe_apps.views.find_safe_apps", return_value=[]
+        ) as find_safe_apps:
+            with revalidating():
+                self.client.get(url)
+            response = self.client.get(url)
+
+        find_safe_apps.assert_called_once()
+        # The revalidated response is cached
+        self.assertEqual(response.json(), [])
+        self.assertEqual(response["Age"], "0")
+
 
 class SafeAppsVisibilityTests(APITestCase):
     def test_visible_safe_app_is_shown(self) -> None:
@@ -612,3 +699,241 @@ class SafeAppsUrlQueryTests(APITestCase):
         json_response = response.json()
         self.assertEqual(response.status_code, 200)
         self.assertTrue(len(json_response) == 0)
+
+
+class SafeAppsCacheKeyTests(APITestCase):
+    def test_equivalent_queries_share_the_cached_response(self) -> None:
+        client = ClientFactory.create(url="safe.global")
+        SafeAppFactory.create(chain_ids=[1], exclusive_clients=(client,))
+        url = reverse("v1:safe-apps:list")
+        response = self.client.get(url, {"chainId": 1, "clientUrl": "safe.global"})
+
+        for query in (
+            "?clientUrl=safe.global&chainId=1",
+            "?chainId=01&clientUrl=safe.global&unknown=1",
+            "?chainId=invalid&chainId=1&clientUrl=safe.global",
+        ):
+            with self.subTest(query=query):
+                with mock.patch("safe_apps.views.find_safe_apps") as find_safe_apps:
+                    equivalent_response = self.client.get(url + query)
+
+                find_safe_apps.assert_not_called()
+                self.assertEqual(equivalent_response.content, response.content)
+                self.assertEqual(equivalent_response["ETag"], response["ETag"])
+
+    def test_unmatched_values_share_the_cached_response(self) -> None:
+        SafeAppFactory.create(chain_ids=[1])
+        url = reverse("v1:safe-apps:list")
+
+        with mock.patch(
+            "safe_apps.views.find_safe_apps", return_value=[]
+        ) as find_safe_apps:
+            for chain_id in (2, 3, 4):
+                self.client.get(url, {"chainId": chain_id})
+            self.client.get(url, {"chainId": 1})
+
+        self.assertEqual(find_safe_apps.call_count, 2)
+        # Distinct responses cached for the current version
+        self.assertEqual(
+            REGISTRY.get_sample_value("cached_responses", {"cache": "safe-apps"}), 2
+        )
+
+    def test_cached_response_reads_the_version_once(self) -> None:
+        SafeAppFactory.create(chain_ids=[1])
+        url = reverse("v1:safe-apps:list")
+        self.client.get(url, {"chainId": 1})
+
+        with mock.patch.object(
+            safe_apps_version, "get", wraps=safe_apps_version.get
+        ) as get_version, mock.patch(
+            "safe_apps.views.filters_key", wraps=filters_key
+        ) as get_filters_key:
+            response = self.client.get(url, {"chainId": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Age", response)
+        get_version.assert_called_once()
+        get_filters_key.assert_called_once()
+
+    def test_not_modified_for_equivalent_query(self) -> None:
+        SafeAppFactory.create(chain_ids=[1])
+        url = reverse("v1:safe-apps:list")
+        response = self.client.get(url, {"chainId": 1})
+
+        not_modified_response = self.client.get(
+            url + "?chainId=1&unknown=1", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(not_modified_response.status_code, 304)
+
+
+class SafeAppsETagTests(APITestCase):
+    def test_not_modified_with_matching_etag(self) -> None:
+        SafeAppFactory.create()
+        url = reverse("v1:safe-apps:list")
+        response = self.client.get(path=url, data=None, format="json")
+
+        with self.assertNumQueries(0):
+            not_modified_response = self.client.get(
+                path=url,
+                data=None,
+                format="json",
+                HTTP_IF_NONE_MATCH=response.headers["ETag"],
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(not_modified_response.status_code, 304)
+        self.assertEqual(not_modified_response.content, b"")
+
+    def test_etag_changes_on_update(self) -> None:
+        safe_app = SafeAppFactory.create()
+        url = reverse("v1:safe-apps:list")
+        etag = self.client.get(path=url, data=None, format="json").headers["ETag"]
+
+        TagFactory.create(name="Updated", safe_apps=(safe_app,))
+        response = self.client.get(
+            path=url, data=None, format="json", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.json()[0]["tags"], ["Updated"])
+
+    def test_exclusive_clients_update_invalidates_cache(self) -> None:
+        safe_app = SafeAppFactory.create()
+        url = reverse("v1:safe-apps:list")
+        self.client.get(path=url, data=None, format="json")
+
+        safe_app.exclusive_clients.add(ClientFactory.create(url="safe.global"))
+        response = self.client.get(path=url, data=None, format="json")
+
+        self.assertEqual(
+            response.json()[0]["accessControl"],
+            {"type": "DOMAIN_ALLOWLIST", "value": ["safe.global"]},
+        )
+
+
+class SafeAppsQueryCountTests(APITestCase):
+    @staticmethod
+    def _create_safe_apps(size: int) -> None:
+        provider = ProviderFactory.create()
+        client = ClientFactory.create()
+        tag = TagFactory.create()
+        for safe_app in SafeAppFactory.create_batch(size, provider=provider):
+            safe_app.exclusive_clients.add(client)
+            tag.safe_apps.add(safe_app)
+        SafeAppFactory.create()
+
+    def test_list_query_count_does_not_depend_on_safe_apps_count(self) -> None:
+        url = reverse("v1:safe-apps:list")
+        self._create_safe_apps(1)
+
+        # Safe Apps (with their provider), exclusive clients and tags
+        with self.assertNumQueries(3):
+            response = self.client.get(path=url, data=None, format="json")
+        self.assertEqual(len(response.json()), 2)
+
+        self._create_safe_apps(20)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(path=url, data=None, format="json")
+        self.assertEqual(len(response.json()), 23)
+
+    def test_access_control_with_prefetched_clients(self) -> None:
+        client_1 = ClientFactory.create(url="safe.com")
+        client_2 = ClientFactory.create(url="pump.com")
+        safe_app = SafeAppFactory.create(exclusive_clients=(client_1, client_2))
+        url = reverse("v1:safe-apps:list") + f"?clientUrl={client_2.url}"
+
+        with self.assertNumQueries(3):
+            response = self.client.get(path=url, data=None, format="json")
+
+        self.assertEqual(
+            response.json()[0]["accessControl"],
+            {"type": "DOMAIN_ALLOWLIST", "value": [client_1.url, client_2.url]},
+        )
+        self.assertEqual(response.json()[0]["id"], safe_app.app_id)
+
+
+class SafeAppsChainIdIndexTests(APITestCase):
+    def test_chain_id_filter_uses_index(self) -> None:
+        # Around 10 (visible) Safe Apps per chain
+        SafeApp.objects.bulk_create(
+            SafeApp(
+                visible=index % 10 != 0,
+                url=f"https://app-{index}.safe.global",
+                name=f"App {index}",
+                icon_url=f"https://app-{index}.safe.global/logo.svg",
+                description=f"Safe App {index}",
+                chain_ids=[index % 500, 500 + index % 7],
+            )
+            for index in range(5_000)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {SafeApp._meta.db_table}")
+        plan = SafeApp.objects.filter(visible=True, chain_ids__contains=[1]).explain()
+
+        self.assertIn("safeapp_visible_chain_ids_gin", plan)
+        self.assertNotIn(f"Seq Scan on {SafeApp._meta.db_table}", plan)
+
+
+class SafeAppsCacheWarmingTests(APITestCase):
+    def test_most_requested_responses_are_warmed(self) -> None:
+        SafeAppFactory.create(app_id=1, chain_ids=[1])
+        url = reverse("v1:safe-apps:list")
+        for _ in range(2):
+            self.client.get(url, {"chainId": 1})
+        self.client.get(url, {"chainId": 2})
+        SafeAppFactory.create(app_id=2, chain_ids=[1])
+
+        with self.settings(SAFE_APPS_CACHE_WARM_SIZE=1):
+            warmed = warm_safe_apps_cache()
+        with mock.patch("safe_apps.views.find_safe_apps") as find_safe_apps:
+            response = self.client.get(url, {"chainId": 1})
+
+        # Served from the cache
+        find_safe_apps.assert_not_called()
+        self.assertEqual(warmed, 1)
+        self.assertEqual([app["id"] for app in response.json()], [1, 2])
+
+    def test_equivalent_requests_are_counted_together(self) -> None:
+        SafeAppFactory.create(app_id=1, chain_ids=[1])
+        url = reverse("v1:safe-apps:list")
+        self.client.get(url, {"chainId": 1})
+        self.client.get(url + "?chainId=01&unknown=1")
+        self.client.get(url, {"chainId": 1}, HTTP_ACCEPT="application/json")
+        for chain_id in (2, 3):
+            self.client.get(url, {"chainId": chain_id})
+
+        self.assertEqual(sorted(_requests.values()), [2, 3])
+        self.assertEqual(len(_cached_requests), 2)
+
+    def test_replayed_requests_are_not_counted(self) -> None:
+        url = reverse("v1:safe-apps:list")
+        self.client.get(url, {"chainId": 1})
+
+        warm_safe_apps_cache()
+        with revalidating():
+            warm_safe_apps_cache()
+
+        self.assertEqual(list(_requests.values()), [1])
+
+    def test_warming_starts_after_commit(self) -> None:
+        self.client.get(reverse("v1:safe-apps:list"))
+
+        with mock.patch("safe_apps.cache.threading.Thread") as thread:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                SafeAppFactory.create()
+            thread.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        thread.assert_called_once()
+        thread.return_value.start.assert_called_once()
+
+    def test_nothing_to_warm(self) -> None:
+        with mock.patch("safe_apps.cache.threading.Thread") as thread:
+            with self.captureOnCommitCallbacks(execute=True):
+                SafeAppFactory.create()
+
+        thread.assert_not_called()
@@ -1,21 +1,40 @@
-from typing import Any
+from typing import Any, Optional
 
-from django.db.models import Q, QuerySet
+from django.http import HttpRequest
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.views.decorators.http import etag
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.generics import ListAPIView
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from config.cache import request_version, version_etag, versioned_cache_page
+
+from .cache import count_request, revalidate_safe_apps_response, safe_apps_version
+from .index import filters_key, find_safe_apps, get_filters, get_index
 from .models import SafeApp
 from .serializers import SafeAppsResponseSerializer
 
 
+def safe_apps_cache_key(request: HttpRequest) -> str:
+    """
+    Only the filters change the response (which has no links to the host). The
+    key is computed once per request: the request counter, the ETag and the
+    cached response all use it
+    """
+    key: Optional[str] = request.__dict__.get("_safe_apps_cache_key")
+    if key is None:
+        index = get_index(request_version(safe_apps_version, request))
+        key = filters_key(get_filters(request.GET), index)
+        request.__dict__["_safe_apps_cache_key"] = key
+    return key
+
+
 class SafeAppsListView(ListAPIView):  # type: ignore[type-arg]
     serializer_class = SafeAppsResponseSerializer
     pagination_class = None
+    queryset = SafeApp.objects.filter(visible=True)
 
     _swagger_chain_id_param = openapi.Parameter(
         "chainId",
@@ -36,7 +55,17 @@ class SafeAppsListView(ListAPIView):  # type: ignore[type-arg]
         type=openapi.TYPE_STRING,
     )
 
-    @method_decorator(cache_page(60 * 10, cache="safe-apps"))  # Cache 10 minutes
+    @method_decorator(etag(version_etag(safe_apps_version, safe_apps_cache_key)))
+    @method_decorator(
+        versioned_cache_page(
+            safe_apps_version,
+            60 * 10,
+            cache="safe-apps",
+            stale_timeout=60 * 60,
+            revalidate=revalidate_safe_apps_response,
+            key_func=safe_apps_cache_key,
+        )
+    )  # Fresh for 10 minutes, then served for 1 hour while being rendered again
     @swagger_auto_schema(
         manual_parameters=[
             _swagger_chain_id_param,
@@ -51,21 +80,19 @@ class SafeAppsListView(ListAPIView):  # type: ignore[type-arg]
         """
         return super().get(request, *args, **kwargs)
 
-    def get_queryset(self) -> QuerySet[SafeApp]:
-        queryset = SafeApp.objects.filter(visible=True)
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        super().initial(request, *args, **kwargs)
+        # Every request is counted, even the ones served from the caches, so
+        # that the most requested ones are warmed up after a change
+        count_request(request, safe_apps_cache_key(request))
 
-        chain_id = self.request.query_params.get("chainId")
-        if chain_id is not None and chain_id.isdigit():
-            queryset = queryset.filter(chain_ids__contains=[chain_id])
-
-        client_url = self.request.query_params.get("clientUrl")
-        if client_url and "\0" not in client_url:
-            queryset = queryset.filter(
-                Q(exclusive_clients__url=client_url) | Q(exclusive_clients__isnull=True)
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        # Safe Apps are served from the in-memory index, the queryset is unused
+        filters = get_filters(request.query_params)
+        return Response(
+            find_safe_apps(
+                chain_id=filters.chain_id,
+                client_url=filters.client_url,
+                url=filters.url,
             )
-
-        url = self.request.query_params.get("url")
-        if url and "\0" not in url:
-            queryset = queryset.filter(url=url)
-
-        return queryset
+        )